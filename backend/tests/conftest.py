@@ -0,0 +1,8 @@
+import os
+
+# Under pytest-xdist each worker gets its own SQLite file, so one worker's
+# init_db()/drop_tables() never races another's. Must run before app.config
+# is imported, since the engine is built from settings at import time.
+_worker = os.environ.get("PYTEST_XDIST_WORKER")
+if _worker:
+    os.environ["DATABASE_URL"] = f"sqlite:///./test_ps05_{_worker}.db"
@@ -1,11 +1,22 @@
+import asyncio
+import os
+
+import httpx
 import pytest
-from fastapi.testclient import TestClient
+import pytest_asyncio
 from app.main import app
 from app.database.database import init_db, drop_tables
 from app.config.settings import settings
 
-# Create test client
-client = TestClient(app)
+# Run in parallel with: pytest -n auto tests/
+# Each xdist worker uses its own SQLite database (see conftest.py).
+
+@pytest.fixture(scope="session")
+def event_loop():
+    """One event loop per session so the async client can be session-scoped."""
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
 
 @pytest.fixture(scope="session")
 def setup_database():
@@ -13,28 +24,44 @@ def setup_database():
     init_db()
     yield
     drop_tables()
+    # Per-worker databases are throwaway files; remove them once dropped
+    if "PYTEST_XDIST_WORKER" in os.environ:
+        db_path = settings.DATABASE_URL.replace("sqlite:///", "", 1)
+        if os.path.exists(db_path):
+            os.remove(db_path)
+
+@pytest_asyncio.fixture(scope="session")
+async def aclient(setup_database):
+    """Async client shared across the session; app lifespan runs once."""
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://t") as client:
+            yield client
 
-def test_root_endpoint():
+@pytest.mark.asyncio
+async def test_root_endpoint(aclient):
     """Test root endpoint."""
-    response = client.get("/")
+    response = await aclient.get("/")
     assert response.status_code == 200
     data = response.json()
     assert "message" in data
     assert "version" in data
     assert data["message"] == settings.PROJECT_NAME
 
-def test_health_check():
+@pytest.mark.asyncio
+async def test_health_check(aclient):
     """Test health check endpoint."""
-    response = client.get("/health")
+    response = await aclient.get("/health")
     assert response.status_code == 200
     data = response.json()
     assert "status" in data
     assert "timestamp" in data
     assert "version" in data
 
-def test_api_info():
+@pytest.mark.asyncio
+async def test_api_info(aclient):
     """Test API info endpoint."""
-    response = client.get("/api/v1/info")
+    response = await aclient.get("/api/v1/info")
     assert response.status_code == 200
     data = response.json()
     assert "name" in data
@@ -42,18 +69,20 @@ def test_api_info():
     assert "supported_languages" in data
     assert "supported_stages" in data
 
-def test_supported_languages():
+@pytest.mark.asyncio
+async def test_supported_languages(aclient):
     """Test supported languages endpoint."""
-    response = client.get("/api/v1/languages")
+    response = await aclient.get("/api/v1/languages")
     assert response.status_code == 200
     data = response.json()
     assert "supported_languages" in data
     assert "language_names" in data
     assert len(data["supported_languages"]) > 0
 
-def test_processing_stages():
+@pytest.mark.asyncio
+async def test_processing_stages(aclient):
     """Test processing stages endpoint."""
-    response = client.get("/api/v1/stages")
+    response = await aclient.get("/api/v1/stages")
     assert response.status_code == 200
     data = response.json()
     assert "stages" in data
@@ -62,44 +91,50 @@ def test_processing_stages():
     assert data["stages"][1]["stage"] == 2
     assert data["stages"][2]["stage"] == 3
 
-def test_storage_stats():
+@pytest.mark.asyncio
+async def test_storage_stats(aclient):
     """Test storage stats endpoint."""
-    response = client.get("/api/v1/storage/stats")
+    response = await aclient.get("/api/v1/storage/stats")
     assert response.status_code == 200
     data = response.json()
     assert "total_files" in data
     assert "total_size_bytes" in data
     assert "upload_directory" in data
 
-def test_documents_endpoint():
+@pytest.mark.asyncio
+async def test_documents_endpoint(aclient):
     """Test documents endpoint."""
-    response = client.get("/api/v1/documents")
+    response = await aclient.get("/api/v1/documents")
     assert response.status_code == 200
     data = response.json()
     assert isinstance(data, list)
 
-def test_metrics_endpoint():
+@pytest.mark.asyncio
+async def test_metrics_endpoint(aclient):
     """Test metrics endpoint."""
-    response = client.get("/api/v1/metrics")
+    response = await aclient.get("/api/v1/metrics")
     assert response.status_code == 200
     data = response.json()
     assert "timestamp" in data
     assert "cpu_usage" in data
     assert "memory_usage" in data
 
-def test_invalid_document_status():
+@pytest.mark.asyncio
+async def test_invalid_document_status(aclient):
     """Test invalid document status endpoint."""
-    response = client.get("/api/v1/status/invalid-id")
+    response = await aclient.get("/api/v1/status/invalid-id")
     assert response.status_code == 404
 
-def test_invalid_document_delete():
+@pytest.mark.asyncio
+async def test_invalid_document_delete(aclient):
     """Test invalid document delete endpoint."""
-    response = client.delete("/api/v1/documents/invalid-id")
+    response = await aclient.delete("/api/v1/documents/invalid-id")
     assert response.status_code == 404
 
-def test_invalid_document_download():
+@pytest.mark.asyncio
+async def test_invalid_document_download(aclient):
     """Test invalid document download endpoint."""
-    response = client.get("/api/v1/documents/invalid-id/download")
+    response = await aclient.get("/api/v1/documents/invalid-id/download")
     assert response.status_code == 404
 
 if __name__ == "__main__":
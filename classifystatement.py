@@ -1,6 +1,13 @@
-import pdfplumber
+import pypdfium2 as pdfium
 import re
+import numpy as np
 import pandas as pd
+from contextlib import closing
+
+try:
+    import re2  # google-re2: linear-time DFA matching, no backtracking
+except ImportError:
+    re2 = None
 
 # --- CATEGORY DEFINITIONS ---
 DEBIT_CATEGORIES = {
@@ -26,58 +33,116 @@ CREDIT_CATEGORIES = {
 # --- PDF PATH ---
 pdf_path = "1Acct Statement_1725_03102025_20.52.45_unlocked (2).pdf"
 
-data = []
-pattern = re.compile(
-    r"(\d{2}/\d{2}/\d{2})\s+(.+?)\s+(\d{2}/\d{2}/\d{2})?\s*([\d,]+\.\d{2})?\s*([\d,]+\.\d{2})?\s*([\d,]+\.\d{2})"
+# Columns are accumulated directly (one list per field) rather than as a
+# list of per-row dicts, so the DataFrame is built without a transpose.
+# Amounts stay raw bytes here and are parsed in one vectorized pass below.
+dates, narrations, withdrawals, deposits, balances = [], [], [], [], []
+
+# One transaction per line, anchored at the line start. Matched against the
+# whole page at once, so horizontal whitespace only ([ \t]) is allowed between
+# fields to keep a match from running into the next line.
+TRANSACTION_PATTERN = (
+    rb"(?m)^[ \t]*(\d{2}/\d{2}/\d{2})[ \t]+(.+?)[ \t]+(\d{2}/\d{2}/\d{2})?[ \t]*"
+    rb"([\d,]+\.\d{2})?[ \t]*([\d,]+\.\d{2})?[ \t]*([\d,]+\.\d{2})"
 )
 
+def compile_pattern(regex):
+    """Compile with re2 when available, falling back to stdlib re."""
+    if re2 is not None:
+        try:
+            return re2.compile(regex)
+        except Exception:
+            pass  # re2 rejected the pattern; stdlib re handles it
+    return re.compile(regex)
+
+pattern = compile_pattern(TRANSACTION_PATTERN)
+
+# --- CATEGORY PATTERNS ---
+# One alternation per category, applied column-wise to the whole DataFrame
+# instead of classifying rows one at a time. Keywords are lowercase and the
+# narrations are lowercased once up front, so matching is case-sensitive.
+def compile_category_patterns(categories):
+    return {
+        category: re.compile("|".join(map(re.escape, keywords)))
+        for category, keywords in categories.items()
+    }
+
+DEBIT_PATTERNS = compile_category_patterns(DEBIT_CATEGORIES)
+CREDIT_PATTERNS = compile_category_patterns(CREDIT_CATEGORIES)
+
+# Fixed label set for the Category column (shared names such as "Transfer"
+# appear once); stored as a pandas Categorical so grouping runs on int codes.
+CATEGORY_LABELS = list(dict.fromkeys([
+    *DEBIT_CATEGORIES, "Uncategorized Debit",
+    *CREDIT_CATEGORIES, "Uncategorized Credit",
+    "Unknown",
+]))
+CATEGORY_DTYPE = pd.CategoricalDtype(CATEGORY_LABELS)
+CATEGORY_CODES = {label: code for code, label in enumerate(CATEGORY_LABELS)}
+
 # --- CATEGORY CLASSIFICATION FUNCTION ---
-def classify_transaction(narration, debit, credit):
-    narration_low = narration.lower()
+def classify_transactions(df):
+    debit = (df["Withdrawal"] > 0).to_numpy()
+    credit = ~debit & (df["Deposit"] > 0).to_numpy()
+    narration = df["Narration"].str.lower()
+    # Work on int8 codes into CATEGORY_LABELS; labels are only attached at the end
+    codes = np.full(len(df), CATEGORY_CODES["Unknown"], dtype=np.int8)
 
-    if debit != "0":  # debit transaction
-        for category, keywords in DEBIT_CATEGORIES.items():
-            if any(keyword in narration_low for keyword in keywords):
-                return category
-        return "Uncategorized Debit"
+    for side, fallback, patterns in (
+        (debit, "Uncategorized Debit", DEBIT_PATTERNS),
+        (credit, "Uncategorized Credit", CREDIT_PATTERNS),
+    ):
+        codes[side] = CATEGORY_CODES[fallback]
+        # Categories are tried in dict order; each pass only scans the rows
+        # that no earlier category has claimed.
+        pending = side.copy()
+        for name, pat in patterns.items():
+            rows = np.flatnonzero(pending)
+            hits = rows[narration.iloc[rows].str.contains(pat, na=False).to_numpy()]
+            codes[hits] = CATEGORY_CODES[name]
+            pending[hits] = False
 
-    elif credit != "0":  # credit transaction
-        for category, keywords in CREDIT_CATEGORIES.items():
-            if any(keyword in narration_low for keyword in keywords):
-                return category
-        return "Uncategorized Credit"
+    return pd.Categorical.from_codes(codes, dtype=CATEGORY_DTYPE)
 
-    return "Unknown"
+def parse_amounts(values):
+    """Parse b"1,234.50"-style amounts in one vectorized pass."""
+    if not values:
+        return np.empty(0, dtype=np.float64)
+    return np.char.replace(np.array(values, dtype=np.bytes_), b",", b"").astype(np.float64)
 
 # --- EXTRACT DATA ---
-with pdfplumber.open(pdf_path) as pdf:
-    for page in pdf.pages:
-        text = page.extract_text()
-        for line in text.split("\n"):
-            match = pattern.search(line)
-            if match:
-                date = match.group(1)
-                narration = match.group(2).strip()
-                withdrawal = match.group(4) if match.group(4) else "0"
-                deposit = match.group(5) if match.group(5) else "0"
-                balance = match.group(6)
-
-                category = classify_transaction(narration, withdrawal, deposit)
-
-                data.append({
-                    "Date": date,
-                    "Narration": narration,
-                    "Withdrawal": float(withdrawal.replace(",", "")) if withdrawal != "0" else 0.0,
-                    "Deposit": float(deposit.replace(",", "")) if deposit != "0" else 0.0,
-                    "Balance": float(balance.replace(",", "")),
-                    "Category": category
-                })
+# PDFium's native text extractor; only plain text is needed, so there is no
+# point paying for pdfplumber's layout reconstruction. Pages and text pages
+# are closed explicitly to release their native buffers.
+with pdfium.PdfDocument(pdf_path) as pdf:
+    for page in pdf:
+        with closing(page), closing(page.get_textpage()) as textpage:
+            text = textpage.get_text_range()
+        for match in pattern.finditer(text.encode()):
+            withdrawal, deposit = match.group(4), match.group(5)
+            dates.append(match.group(1).decode())
+            narrations.append(match.group(2).decode().strip())
+            withdrawals.append(withdrawal or b"0")
+            deposits.append(deposit or b"0")
+            balances.append(match.group(6))
 
 # --- CONVERT TO DATAFRAME ---
-df = pd.DataFrame(data)
+df = pd.DataFrame({
+    "Date": dates,
+    "Narration": narrations,
+    "Withdrawal": parse_amounts(withdrawals),
+    "Deposit": parse_amounts(deposits),
+    "Balance": parse_amounts(balances),
+})
+df["Category"] = classify_transactions(df)
 
 # --- AGGREGATED TOTALS ---
-category_totals = df.groupby("Category")[["Withdrawal", "Deposit"]].sum().reset_index()
+# observed=True keeps only categories that actually occur in the statement.
+category_totals = (
+    df.groupby("Category", observed=True)[["Withdrawal", "Deposit"]]
+    .sum()
+    .reset_index()
+)
 
 # --- SAVE CLEANED DATA ---
 df.to_csv("classified_statement.csv", index=False)
@@ -0,0 +1,37 @@
+"""
+Repository-wide pytest configuration
+
+Tests are independent and can run in parallel with pytest-xdist
+(`pytest -n auto --dist loadgroup`). Each worker is kept single-threaded so N
+workers do not oversubscribe the cores with N OpenMP/MKL thread pools; tests
+marked `serial` touch the GPU and are pinned to one worker so only one process
+holds the device at a time.
+"""
+
+import os
+
+# Must be set before cv2/torch/numpy spin up their thread pools (torch sizes its
+# intra-op pool from OMP_NUM_THREADS when the test modules first import it)
+if 'PYTEST_XDIST_WORKER' in os.environ:
+    for var in ('OMP_NUM_THREADS', 'OMP_THREAD_LIMIT', 'OPENBLAS_NUM_THREADS',
+                'MKL_NUM_THREADS', 'NUMEXPR_NUM_THREADS'):
+        os.environ.setdefault(var, '1')
+    os.environ.setdefault('TOKENIZERS_PARALLELISM', 'false')
+
+import cv2
+import pytest
+
+if 'PYTEST_XDIST_WORKER' in os.environ:
+    cv2.setNumThreads(1)  # OpenCV's own pool ignores the OpenMP variables
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "serial: uses the GPU; runs on a single xdist worker")
+
+# Runs before xdist's own hook, which tags grouped node ids under --dist loadgroup
+@pytest.hookimpl(tryfirst=True)
+def pytest_collection_modifyitems(config, items):
+    if not config.pluginmanager.hasplugin('xdist'):
+        return
+    for item in items:
+        if item.get_closest_marker('serial') is not None:
+            item.add_marker(pytest.mark.xdist_group('gpu'))
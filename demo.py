@@ -9,38 +9,62 @@ by processing sample documents and showing the results.
 import cv2
 import numpy as np
 import json
-import tempfile
-import os
+import time
 from pathlib import Path
 
 from src.pipeline.infer_page import PS05Pipeline
 
+# Top-level result keys produced by stage 1 (layout detection)
+STAGE1_KEYS = ('page', 'size', 'elements', 'preprocess', 'processing_time')
+
+# Rendered text tiles keyed by (text, font_scale, color, thickness)
+_TEXT_CACHE = {}
+
+def _render_tile(text, scale, color, thickness):
+    """Rasterize text once onto a white tile padded to hold the full stroke width."""
+    (tw, th), baseline = cv2.getTextSize(text, cv2.FONT_HERSHEY_SIMPLEX, scale, thickness)
+    pad = thickness
+    tile = np.full((th + baseline + 2 * pad, tw + 2 * pad, 3), 255, dtype=np.uint8)
+    cv2.putText(tile, text, (pad, pad + th), cv2.FONT_HERSHEY_SIMPLEX, scale, color, thickness)
+    ink = (tile != 255).any(axis=2, keepdims=True)
+    return tile, ink, th + pad, pad
+
+def _blit_text(img, text, org, scale, color, thickness):
+    """Draw text like cv2.putText on a white canvas, reusing cached tiles for repeated strings."""
+    key = (text, scale, color, thickness)
+    if key not in _TEXT_CACHE:
+        _TEXT_CACHE[key] = _render_tile(text, scale, color, thickness)
+    tile, ink, top, left = _TEXT_CACHE[key]
+
+    # Clip the tile against the canvas before compositing
+    y0, x0 = org[1] - top, org[0] - left
+    cy0, cx0 = max(y0, 0), max(x0, 0)
+    cy1, cx1 = min(y0 + tile.shape[0], img.shape[0]), min(x0 + tile.shape[1], img.shape[1])
+    if cy0 >= cy1 or cx0 >= cx1:
+        return
+    ty, tx = slice(cy0 - y0, cy1 - y0), slice(cx0 - x0, cx1 - x0)
+    np.copyto(img[cy0:cy1, cx0:cx1], tile[ty, tx], where=ink[ty, tx])
+
 def create_sample_document():
     """Create a sample document image for demonstration."""
     # Create a white background
-    img = np.ones((1200, 800, 3), dtype=np.uint8) * 255
+    img = np.full((1200, 800, 3), 255, dtype=np.uint8)
     
     # Add title
-    cv2.putText(img, "Sample Document", (50, 100), 
-               cv2.FONT_HERSHEY_SIMPLEX, 2, (0, 0, 0), 3)
+    _blit_text(img, "Sample Document", (50, 100), 2, (0, 0, 0), 3)
     
     # Add subtitle
-    cv2.putText(img, "Multilingual Document Understanding", (50, 150), 
-               cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 0, 0), 2)
+    _blit_text(img, "Multilingual Document Understanding", (50, 150), 1, (0, 0, 0), 2)
     
     # Add text content
-    cv2.putText(img, "This is a sample document for testing", (50, 250), 
-               cv2.FONT_HERSHEY_SIMPLEX, 0.8, (0, 0, 0), 2)
-    cv2.putText(img, "the PS-05 document understanding system.", (50, 280), 
-               cv2.FONT_HERSHEY_SIMPLEX, 0.8, (0, 0, 0), 2)
+    _blit_text(img, "This is a sample document for testing", (50, 250), 0.8, (0, 0, 0), 2)
+    _blit_text(img, "the PS-05 document understanding system.", (50, 280), 0.8, (0, 0, 0), 2)
     
     # Add Hindi text
-    cv2.putText(img, "यह एक नमूना दस्तावेज़ है", (50, 350), 
-               cv2.FONT_HERSHEY_SIMPLEX, 0.8, (0, 0, 0), 2)
+    _blit_text(img, "यह एक नमूना दस्तावेज़ है", (50, 350), 0.8, (0, 0, 0), 2)
     
     # Add Arabic text
-    cv2.putText(img, "هذا مستند عينة", (50, 400), 
-               cv2.FONT_HERSHEY_SIMPLEX, 0.8, (0, 0, 0), 2)
+    _blit_text(img, "هذا مستند عينة", (50, 400), 0.8, (0, 0, 0), 2)
     
     # Add a simple table-like structure
     cv2.rectangle(img, (50, 500), (750, 700), (0, 0, 0), 2)
@@ -48,24 +72,17 @@ def create_sample_document():
     cv2.line(img, (200, 500), (200, 700), (0, 0, 0), 2)
     cv2.line(img, (400, 500), (400, 700), (0, 0, 0), 2)
     
-    cv2.putText(img, "Column 1", (70, 530), 
-               cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 0, 0), 2)
-    cv2.putText(img, "Column 2", (220, 530), 
-               cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 0, 0), 2)
-    cv2.putText(img, "Column 3", (420, 530), 
-               cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 0, 0), 2)
+    _blit_text(img, "Column 1", (70, 530), 0.6, (0, 0, 0), 2)
+    _blit_text(img, "Column 2", (220, 530), 0.6, (0, 0, 0), 2)
+    _blit_text(img, "Column 3", (420, 530), 0.6, (0, 0, 0), 2)
     
-    cv2.putText(img, "Data 1", (70, 580), 
-               cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 0, 0), 2)
-    cv2.putText(img, "Data 2", (220, 580), 
-               cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 0, 0), 2)
-    cv2.putText(img, "Data 3", (420, 580), 
-               cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 0, 0), 2)
+    _blit_text(img, "Data 1", (70, 580), 0.6, (0, 0, 0), 2)
+    _blit_text(img, "Data 2", (220, 580), 0.6, (0, 0, 0), 2)
+    _blit_text(img, "Data 3", (420, 580), 0.6, (0, 0, 0), 2)
     
     # Add a simple chart-like structure
     cv2.rectangle(img, (50, 750), (350, 1100), (0, 0, 0), 2)
-    cv2.putText(img, "Sample Chart", (70, 780), 
-               cv2.FONT_HERSHEY_SIMPLEX, 0.8, (0, 0, 0), 2)
+    _blit_text(img, "Sample Chart", (70, 780), 0.8, (0, 0, 0), 2)
     
     # Draw some bars
     cv2.rectangle(img, (80, 900), (120, 1050), (255, 0, 0), -1)
@@ -83,20 +100,27 @@ def run_demo():
     print("📄 Creating sample document...")
     sample_img = create_sample_document()
     
-    # Save to temporary file
-    with tempfile.NamedTemporaryFile(suffix='.png', delete=False) as tmp:
-        cv2.imwrite(tmp.name, sample_img)
-        image_path = tmp.name
-    
     try:
         # Initialize pipeline
         print("🔧 Initializing PS-05 pipeline...")
         pipeline = PS05Pipeline()
         
+        # Run all three stages in a single pass on the in-memory image; the
+        # stage 3 result is cumulative, so the stage 1 and stage 2 views are
+        # sliced from it.
+        start_time = time.time()
+        result3 = pipeline.process_image(sample_img, stage=3)
+        total_time = time.time() - start_time
+        
+        if 'error' in result3:
+            raise RuntimeError(result3['error'])
+        
+        result1 = {k: result3[k] for k in STAGE1_KEYS if k in result3}
+        result2 = {**result1, 'text_lines': result3.get('text_lines', [])}
+        
         # Stage 1: Layout Detection
         print("\n📊 Stage 1: Layout Detection")
         print("-" * 30)
-        result1 = pipeline.process_image(image_path, stage=1)
         
         print(f"✅ Processing time: {result1.get('processing_time', 0):.2f}s")
         print(f"📏 Image size: {result1['size']['w']}x{result1['size']['h']}")
@@ -108,7 +132,6 @@ def run_demo():
         # Stage 2: OCR and Language ID
         print("\n📝 Stage 2: OCR and Language Identification")
         print("-" * 40)
-        result2 = pipeline.process_image(image_path, stage=2)
         
         if 'text_lines' in result2:
             print(f"📄 Detected {len(result2['text_lines'])} text lines:")
@@ -118,7 +141,6 @@ def run_demo():
         # Stage 3: Natural Language Generation
         print("\n🤖 Stage 3: Natural Language Generation")
         print("-" * 35)
-        result3 = pipeline.process_image(image_path, stage=3)
         
         if 'tables' in result3 and result3['tables']:
             print(f"📊 Table analysis: {result3['tables'][0]['summary']}")
@@ -131,7 +153,8 @@ def run_demo():
         output_dir.mkdir(exist_ok=True)
         
         # Save sample image
-        cv2.imwrite(str(output_dir / "sample_document.png"), sample_img)
+        cv2.imwrite(str(output_dir / "sample_document.png"), sample_img,
+                    [cv2.IMWRITE_PNG_COMPRESSION, 1])
         
         # Save results
         with open(output_dir / "stage1_results.json", 'w') as f:
@@ -154,11 +177,7 @@ def run_demo():
         print("\n📈 Performance Summary")
         print("-" * 20)
         print(f"Stage 1 time: {result1.get('processing_time', 0):.2f}s")
-        print(f"Stage 2 time: {result2.get('processing_time', 0):.2f}s")
-        print(f"Stage 3 time: {result3.get('processing_time', 0):.2f}s")
-        
-        total_time = result3.get('processing_time', 0)
-        print(f"Total processing time: {total_time:.2f}s")
+        print(f"Total processing time (stages 1-3): {total_time:.2f}s")
         
         if total_time > 0:
             throughput = 1.0 / total_time
@@ -170,11 +189,6 @@ def run_demo():
         print(f"❌ Demo failed: {e}")
         import traceback
         traceback.print_exc()
-    
-    finally:
-        # Clean up
-        if os.path.exists(image_path):
-            os.remove(image_path)
 
 def show_usage_examples():
     """Show usage examples."""
@@ -1,8 +1,8 @@
 import argparse
 from pathlib import Path
-import json
 import cv2
 import numpy as np
+import orjson
 
 COLOR_MAP = {
     "Background": (200, 200, 200),
@@ -13,50 +13,91 @@ COLOR_MAP = {
     "Figure": (244, 67, 54),
 }
 
+# Stage 3 result keys with their box color and label (None: label from chart type)
+_S3 = (
+    ("tables", (102, 0, 204), "Table"),
+    ("figures", (0, 0, 255), "Figure"),
+    ("charts", (0, 102, 204), None),
+    ("maps", (0, 204, 102), "Map"),
+)
 
-def draw_bbox(img, bbox, color, label=None):
+
+def draw_bbox(img, bbox, color, label=None, pending_labels=None):
     x, y, w, h = map(int, bbox)
     cv2.rectangle(img, (x, y), (x + w, y + h), color, 2)
     if label:
-        cv2.rectangle(img, (x, y - 20), (x + min(220, w), y), color, -1)
+        if pending_labels is None:
+            draw_labels(img, [(x, y, w, color, label)])
+        else:
+            pending_labels.append((x, y, w, color, label))
+
+
+def draw_labels(img, labels):
+    """Draw filled label bars with NumPy slice fills, then the label text on top."""
+    for x, y, w, color, _ in labels:
+        # Same pixels as cv2.rectangle((x, y - 20), (x + min(220, w), y), color, -1)
+        img[max(0, y - 20):max(0, y + 1), max(0, x):max(0, x + min(220, w) + 1)] = color
+    for x, y, _, _, label in labels:
         cv2.putText(img, label, (x + 4, y - 5), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 1)
 
 
-def overlay(image_path: Path, json_path: Path, stage: int, out_path: Path):
-    img = cv2.imread(str(image_path))
+def overlay_one(image_path: str, json_path: str, stage: int, out_path: str):
+    """Render one overlay; paths are pre-stringified and the output dir must exist."""
+    img = cv2.imread(image_path)
     if img is None:
         raise RuntimeError(f"Failed to read image: {image_path}")
 
-    with open(json_path, "r", encoding="utf-8") as f:
-        data = json.load(f)
+    with open(json_path, "rb") as f:
+        data = orjson.loads(f.read())
+
+    # Label bars and text are drawn after all boxes, in one pass
+    labels = []
 
     # Stage 1: elements
-    for el in data.get("elements", []):
+    for el in data.get("elements", ()):
         cls = el.get("cls", "Text")
-        color = COLOR_MAP.get(cls, (0, 255, 255))
-        score = el.get("score", 0)
-        label = f"{cls} {score:.2f}"
-        draw_bbox(img, el.get("bbox", [0, 0, 0, 0]), color, label)
+        draw_bbox(img, el.get("bbox", [0, 0, 0, 0]), COLOR_MAP.get(cls, (0, 255, 255)),
+                  f"{cls} {el.get('score', 0):.2f}", labels)
 
     # Stage 2: text lines
     if stage >= 2:
-        for tl in data.get("text_lines", []):
-            draw_bbox(img, tl.get("bbox", [0, 0, 0, 0]), (0, 255, 255), tl.get("lang", ""))
+        for tl in data.get("text_lines", ()):
+            draw_bbox(img, tl.get("bbox", [0, 0, 0, 0]), (0, 255, 255), tl.get("lang", ""), labels)
 
     # Stage 3: tables/figures/charts/maps
     if stage >= 3:
-        for key, color in ("tables", (102, 0, 204)), ("figures", (0, 0, 255)), ("charts", (0, 102, 204)), ("maps", (0, 204, 102)):
-            for item in data.get(key, []):
-                label = key[:-1].capitalize()
-                if key == "charts":
-                    label = f"Chart:{item.get('type', 'unk')}"
-                draw_bbox(img, item.get("bbox", [0, 0, 0, 0]), color, label)
+        for key, color, label in _S3:
+            for item in data.get(key, ()):
+                draw_bbox(img, item.get("bbox", [0, 0, 0, 0]), color,
+                          label or f"Chart:{item.get('type', 'unk')}", labels)
+
+    draw_labels(img, labels)
 
+    # Overlays are for inspection: fast zlib level 1 instead of the default 3
+    cv2.imwrite(out_path, img, [cv2.IMWRITE_PNG_COMPRESSION, 1])
+    return out_path
+
+
+def overlay(image_path: Path, json_path: Path, stage: int, out_path: Path):
+    out_path = Path(out_path)
     out_path.parent.mkdir(parents=True, exist_ok=True)
-    cv2.imwrite(str(out_path), img)
+    overlay_one(str(image_path), str(json_path), stage, str(out_path))
     return out_path
 
 
+def overlay_batch(pairs, stage: int, out_dir: Path):
+    """Overlay many (image, json) pairs into out_dir, creating it only once."""
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    outs = []
+    for image_path, json_path in pairs:
+        image_path = Path(image_path)
+        out_path = out_dir / image_path.with_suffix(".overlay.png").name
+        overlay_one(str(image_path), str(json_path), stage, str(out_path))
+        outs.append(out_path)
+    return outs
+
+
 def main():
     ap = argparse.ArgumentParser(description="Overlay viewer for PS-05 outputs")
     ap.add_argument("--image", required=True)
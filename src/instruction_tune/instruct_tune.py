@@ -2,18 +2,26 @@
 This script demonstrates generating synthetic (intermediate -> NL) pairs and a training loop stub.
 """
 
-import json, os
+import os
 from pathlib import Path
 
+import orjson
+
 def generate_synthetic_pairs(num=1000, out='data/synth_pairs.jsonl'):
     os.makedirs(os.path.dirname(out), exist_ok=True)
-    with open(out, 'w') as f:
-        for i in range(num):
-            # simple synthetic intermediate representation
-            interm = {'type':'table','rows': [['A','B'],['C','D']], 'meta': {'rows':2,'cols':2}}
-            nl = 'A  B; C  D. Table with 2 rows and 2 columns.'
-            obj = {'input': interm, 'output': nl}
-            f.write(json.dumps(obj) + '\n')
+    # simple synthetic intermediate representation (identical for every pair)
+    interm = {'type':'table','rows': [['A','B'],['C','D']], 'meta': {'rows':2,'cols':2}}
+    nl = 'A  B; C  D. Table with 2 rows and 2 columns.'
+    obj = {'input': interm, 'output': nl}
+    # Encode the record once and write it in bounded chunks of repeated lines
+    line = orjson.dumps(obj) + b'\n'
+    full_chunks, remainder = divmod(num, 4096)
+    with open(out, 'wb', buffering=1 << 20) as f:
+        if full_chunks:
+            chunk = line * 4096
+            for _ in range(full_chunks):
+                f.write(chunk)
+        f.write(line * remainder)
     print('Wrote', out)
 
 def train_loop(data_path='data/synth_pairs.jsonl'):
@@ -3,15 +3,27 @@ import argparse, os
 
 import logging
 
+import numpy as np
+
+# Placeholder regions as fractions of (w, h, w, h); float64 so the truncated
+# pixel coordinates match plain Python arithmetic exactly.
+_LAYOUT_FRACTIONS = np.array([
+    [0.05, 0.05, 0.9, 0.1],
+    [0.05, 0.16, 0.9, 0.7],
+    [0.05, 0.88, 0.4, 0.07],
+    [0.55, 0.88, 0.4, 0.07],
+])
+_LAYOUT_LABELS = ("Title", "Text", "Table", "Figure")
+_LAYOUT_SCORES = (0.97, 0.94, 0.92, 0.90)
+
 def detect_layout(image):
     h, w = image.shape[:2]
     logging.info(f"Running layout detection on image of size {w}x{h}")
     # Replace with real model inference
+    bboxes = (_LAYOUT_FRACTIONS * np.array([w, h, w, h])).astype(np.int64).tolist()
     results = [
-        {"label": "Title", "bbox": [int(w*0.05), int(h*0.05), int(w*0.9), int(h*0.1)], "score": 0.97},
-        {"label": "Text", "bbox": [int(w*0.05), int(h*0.16), int(w*0.9), int(h*0.7)], "score": 0.94},
-        {"label": "Table", "bbox": [int(w*0.05), int(h*0.88), int(w*0.4), int(h*0.07)], "score": 0.92},
-        {"label": "Figure", "bbox": [int(w*0.55), int(h*0.88), int(w*0.4), int(h*0.07)], "score": 0.90}
+        {"label": label, "bbox": bbox, "score": score}
+        for label, bbox, score in zip(_LAYOUT_LABELS, bboxes, _LAYOUT_SCORES)
     ]
     logging.info(f"Detected {len(results)} layout regions.")
     return results
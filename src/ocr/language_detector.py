@@ -4,29 +4,92 @@ Provides accurate language identification for 6 languages:
 English, Hindi, Urdu, Arabic, Nepalese, Persian
 """
 
-import re
+import os
+import sys
+import threading
 import numpy as np
-from typing import Dict, List, Tuple, Optional
+from typing import Dict, List, Sequence, Tuple, Optional
 import logging
 from dataclasses import dataclass
 from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
 import langid
 from langdetect import detect, detect_langs
+from langdetect.detector_factory import DetectorFactory, PROFILES_DIRECTORY
 from langdetect.lang_detect_exception import LangDetectException
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+try:
+    import gcld3
+except ImportError:
+    gcld3 = None
+
 logger = logging.getLogger(__name__)
 
-@dataclass
+# Below this many texts a process pool costs more than it saves
+BATCH_POOL_MIN_TEXTS = 32
+
+if numba is not None:
+    @numba.njit(cache=True)
+    def _char_score_kernel(expected, observed):
+        """Per-language mean of 1 - |expected - observed| over the (L, K) frequency matrices"""
+        n, k = expected.shape
+        out = np.empty(n)
+        for i in range(n):
+            acc = 0.0
+            for j in range(k):
+                acc += 1.0 - abs(expected[i, j] - observed[i, j])
+            out[i] = acc / k
+        return out
+else:
+    _char_score_kernel = None
+
+# Process-wide detector returned by get_default_detector()
+_default_detector = None
+_default_detector_lock = threading.Lock()
+
+# Per-process detector for batch_detect workers, built by the pool initializer
+_worker_detector = None
+
+def _init_worker(use_langdetect: bool):
+    global _worker_detector
+    _worker_detector = LanguageDetector(use_langdetect=use_langdetect)
+
+def _worker(args: Tuple[str, str]) -> 'LanguageDetectionResult':
+    """ProcessPoolExecutor entry point for one (text, method) pair"""
+    return _worker_detector._detect_one(*args)
+
+# __slots__ shrink the per-result footprint in large batches (dataclass support needs 3.10+)
+_DATACLASS_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+@dataclass(**_DATACLASS_SLOTS)
 class LanguageDetectionResult:
     """Result of language detection for a text region"""
     detected_language: str
     confidence: float
-    alternative_languages: List[Tuple[str, float]]
+    alternative_languages: Sequence[Tuple[str, float]]
     language_code: str
     is_reliable: bool
 
+# Shared result for blank input and failures; like cached results, treat it as read-only
+_UNKNOWN_RESULT = LanguageDetectionResult(
+    detected_language='Unknown',
+    confidence=0.0,
+    alternative_languages=(),
+    language_code='unknown',
+    is_reliable=False
+)
+
 @dataclass
 class LanguageMetrics:
     """Language detection performance metrics"""
@@ -42,7 +105,11 @@ class LanguageDetector:
     English, Hindi, Urdu, Arabic, Nepalese, Persian
     """
     
-    def __init__(self):
+    def __init__(self, use_langdetect: bool = False):
+        # With the CLD3 backend available, langdetect only breaks ensemble ties, and only
+        # when opted in; without CLD3 the original langid/langdetect ensemble is used
+        self.use_langdetect = use_langdetect
+        
         self.supported_languages = {
             'en': 'English',
             'hi': 'Hindi',
@@ -51,6 +118,10 @@ class LanguageDetector:
             'ne': 'Nepalese',
             'fa': 'Persian'
         }
+        # Frozen views of supported_languages for index-based code (metrics, ranking)
+        self._lang_codes = tuple(self.supported_languages)
+        self._lang_names = tuple(self.supported_languages[c] for c in self._lang_codes)
+        self._lang_index = {code: i for i, code in enumerate(self._lang_codes)}
         
         # Character set patterns for each language
         self.language_patterns = {
@@ -61,6 +132,28 @@ class LanguageDetector:
             'ne': r'[\u0900-\u097F]',  # Nepali uses Devanagari
             'fa': r'[\u0600-\u06FF]'   # Persian uses Arabic script
         }
+        # The same character sets as inclusive codepoint ranges, for one vectorized pass
+        self._script_ranges = {
+            'en': ((0x41, 0x5A), (0x61, 0x7A)),
+            'hi': ((0x900, 0x97F),),
+            'ur': ((0x600, 0x6FF),),
+            'ar': ((0x600, 0x6FF),),
+            'ne': ((0x900, 0x97F),),
+            'fa': ((0x600, 0x6FF),)
+        }
+        # Lookup table codepoint -> script bin (0 = none), one bin per distinct range set,
+        # so a single bincount scores all languages; 0x980 bytes for these scripts
+        script_bins = {}
+        self._script_lut = np.zeros(max(hi for r in self._script_ranges.values() for _, hi in r) + 1, dtype=np.uint8)
+        for ranges in self._script_ranges.values():
+            if ranges not in script_bins:
+                script_bins[ranges] = len(script_bins) + 1
+                for lo, hi in ranges:
+                    self._script_lut[lo:hi + 1] = script_bins[ranges]
+        self._script_nbins = len(script_bins) + 1
+        self._lang_script_bin = np.array(
+            [script_bins[self._script_ranges[code]] for code in self._lang_codes], dtype=np.intp
+        )
         
         # Language-specific features
         self.language_features = {
@@ -90,17 +183,87 @@ class LanguageDetector:
             }
         }
         
+        # Expected character frequencies as (language, char) codepoint / frequency matrices
+        # for bincount lookups; rows follow language_features order
+        self._feature_cps = np.array(
+            [[ord(c) for c in feats['character_freq']] for feats in self.language_features.values()],
+            dtype=np.intp
+        )
+        self._feature_exp = np.array(
+            [list(feats['character_freq'].values()) for feats in self.language_features.values()],
+            dtype=np.float64
+        )
+        if _char_score_kernel is not None:
+            # Compile now rather than on the first long text
+            _char_score_kernel(self._feature_exp, self._feature_exp)
+        # Histogram size; any higher codepoint is clipped into this last, unused bin
+        self._feature_max_cp = int(self._feature_cps.max()) + 1
+        # Short texts skip the histogram: ~30 C-level str.count scans are cheaper below this
+        self._feature_chars = {lang: list(feats['character_freq'].items())
+                               for lang, feats in self.language_features.items()}
+        self._feature_hist_min_chars = 2048
+        
+        # One automaton over every common word, mapping each word to the languages listing it
+        self._word_automaton = None
+        if ahocorasick is not None:
+            word_langs = {}
+            for lang, feats in self.language_features.items():
+                for word in feats['common_words']:
+                    word_langs.setdefault(word, []).append(lang)
+            self._word_automaton = ahocorasick.Automaton()
+            for word, langs in word_langs.items():
+                self._word_automaton.add_word(word, (word, tuple(langs)))
+            self._word_automaton.make_automaton()
+        
+        # langid/langdetect cost grows with input length while accuracy saturates well
+        # before this; pattern and feature methods still see the full string
+        self._classifier_max_chars = 512
+        
         # Initialize language detection libraries
-        self._init_langid()
+        self._init_detectors()
+        
+        # Memoized detection: OCR output repeats many identical strings (headers, labels)
+        self._detect_cached = lru_cache(maxsize=4096)(self._detect_language_uncached)
+
     
-    def _init_langid(self):
-        """Initialize langid library with custom language mapping"""
+    def _init_detectors(self):
+        """Initialize langid and langdetect restricted to the supported languages"""
         try:
             # Set language detection to focus on our supported languages
-            langid.set_languages(list(self.supported_languages.keys()))
+            langid.set_languages(list(self._lang_codes))
             logger.info("LangID initialized successfully")
         except Exception as e:
             logger.warning(f"Failed to initialize LangID: {e}")
+        
+        # Private langdetect factory holding only our 6 profiles instead of all 55
+        self._langdetect_factory = None
+        try:
+            profiles = []
+            for code in self.supported_languages:
+                with open(os.path.join(PROFILES_DIRECTORY, code), encoding='utf-8') as f:
+                    profiles.append(f.read())
+            factory = DetectorFactory()
+            factory.set_seed(0)
+            factory.load_json_profile(profiles)
+            self._langdetect_factory = factory
+            logger.info("LangDetect initialized successfully")
+        except Exception as e:
+            logger.warning(f"Failed to load LangDetect profiles, using the full profile set: {e}")
+        
+        # CLD3: compiled neural n-gram model, much faster than the Python classifiers
+        self._cld3 = None
+        if gcld3 is not None:
+            try:
+                self._cld3 = gcld3.NNetLanguageIdentifier(min_num_bytes=0, max_num_bytes=1000)
+                logger.info("CLD3 initialized successfully")
+            except Exception as e:
+                logger.warning(f"Failed to initialize CLD3: {e}")
+    
+    def _langdetect_detector(self, text: str):
+        """Create a langdetect Detector over the restricted profile set"""
+        detector = self._langdetect_factory.create()
+        detector.append(text)
+        return detector
     
     def detect_language(self, text: str, method: str = 'ensemble') -> LanguageDetectionResult:
         """
@@ -108,22 +271,27 @@ class LanguageDetector:
         
         Args:
             text: Input text to analyze
-            method: Detection method ('ensemble', 'langid', 'langdetect', 'pattern', 'feature')
+            method: Detection method ('ensemble', 'cld3', 'langid', 'langdetect', 'pattern', 'feature')
             
         Returns:
             LanguageDetectionResult with detection details
+            (cached per (text, method); treat it as read-only)
         """
-        if not text or len(text.strip()) == 0:
-            return LanguageDetectionResult(
-                detected_language='Unknown',
-                confidence=0.0,
-                alternative_languages=[],
-                language_code='unknown',
-                is_reliable=False
-            )
-        
+        # Blank OCR lines are common; answer them before the cache or any detector
+        if not text or text.isspace():
+            return _UNKNOWN_RESULT
+        return self._detect_cached(text, method)
+    
+    def clear_cache(self):
+        """Drop memoized detections, e.g. after changing supported_languages"""
+        self._detect_cached.cache_clear()
+    
+    def _detect_language_uncached(self, text: str, method: str) -> LanguageDetectionResult:
+        """Run the requested detection method without the result cache (text is non-blank)"""
         if method == 'ensemble':
             return self._ensemble_detection(text)
+        elif method == 'cld3':
+            return self._detect_with_cld3(text)
         elif method == 'langid':
             return self._detect_with_langid(text)
         elif method == 'langdetect':
@@ -139,11 +307,40 @@ class LanguageDetector:
         """Combine multiple detection methods for better accuracy"""
         results = []
         
+        # Encode and lowercase once for both in-house detectors. The lowercased codepoints
+        # can reuse the original encoding whenever lower() changed nothing (all non-Latin
+        # text and most OCR lines)
+        text_lower = text.lower()
+        cps = np.frombuffer(text.encode('utf-32-le'), dtype=np.uint32)
+        cps_lower = cps if text_lower == text else None
+        
+        # The cheap script scan decides how much of the ensemble is worth running
+        pattern_result = self._patterns_from_cps(cps)
+        skipped = set()
+        if pattern_result.confidence > 0.8:
+            if pattern_result.language_code == 'en':
+                # Latin script maps to a single supported language; nothing left to vote on
+                return pattern_result
+            # One script dominates, so a single n-gram classifier is enough to pick
+            # within it (hi/ne for Devanagari, ur/ar/fa for Arabic script). langid's
+            # raw log-prob score never clears is_reliable, so langdetect is the one kept
+            skipped.add('langid')
+        
         # Try different methods
-        methods = ['langid', 'langdetect', 'pattern', 'feature']
+        if self._cld3 is not None:
+            methods = ['cld3', 'pattern', 'feature']
+        else:
+            methods = ['langid', 'langdetect', 'pattern', 'feature']
         for method in methods:
+            if method in skipped:
+                continue
             try:
-                result = self.detect_language(text, method)
+                if method == 'pattern':
+                    result = pattern_result
+                elif method == 'feature':
+                    result = self._features_from_cps(cps_lower, text_lower, len(text))
+                else:
+                    result = self.detect_language(text, method)
                 if result.is_reliable:
                     results.append(result)
             except Exception as e:
@@ -151,8 +348,8 @@ class LanguageDetector:
                 continue
         
         if not results:
-            # Fallback to pattern-based detection
-            return self._detect_with_patterns(text)
+            # Fallback to pattern-based detection, already computed above
+            return pattern_result
         
         # Aggregate results
         language_votes = Counter()
@@ -165,6 +362,20 @@ class LanguageDetector:
                 confidence_sum[lang_code] = 0
             confidence_sum[lang_code] += result.confidence
         
+        # langdetect as an opt-in tiebreaker when it did not vote already
+        if self.use_langdetect and 'langdetect' not in methods and len(language_votes) > 1:
+            (_, top_votes), (_, runner_up_votes) = language_votes.most_common(2)
+            if top_votes == runner_up_votes:
+                try:
+                    result = self.detect_language(text, 'langdetect')
+                    if result.is_reliable:
+                        language_votes[result.language_code] += 1
+                        confidence_sum[result.language_code] = (
+                            confidence_sum.get(result.language_code, 0) + result.confidence
+                        )
+                except Exception as e:
+                    logger.debug(f"Method langdetect failed: {e}")
+        
         # Find most voted language
         if language_votes:
             most_voted = language_votes.most_common(1)[0][0]
@@ -185,26 +396,41 @@ class LanguageDetector:
                 is_reliable=confidence > 0.6
             )
         
-        # Fallback
-        return LanguageDetectionResult(
-            detected_language='Unknown',
-            confidence=0.0,
-            alternative_languages=[],
-            language_code='unknown',
-            is_reliable=False
-        )
+        return _UNKNOWN_RESULT
+    
+    def _detect_with_cld3(self, text: str) -> LanguageDetectionResult:
+        """Detect language using the CLD3 neural model (langdetect if CLD3 is unavailable)"""
+        if self._cld3 is None:
+            return self.detect_language(text, 'langdetect')
+        try:
+            result = self._cld3.FindLanguage(text=text[:self._classifier_max_chars])
+            lang_code, confidence = result.language, result.probability
+            
+            if lang_code in self.supported_languages:
+                return LanguageDetectionResult(
+                    detected_language=self.supported_languages[lang_code],
+                    confidence=confidence,
+                    alternative_languages=(),
+                    language_code=lang_code,
+                    is_reliable=result.is_reliable and confidence > 0.6
+                )
+            return self._find_closest_language(lang_code, confidence)
+        
+        except Exception as e:
+            logger.debug(f"CLD3 detection failed: {e}")
+            return self.detect_language(text, 'pattern')
     
     def _detect_with_langid(self, text: str) -> LanguageDetectionResult:
         """Detect language using langid library"""
         try:
-            lang_code, confidence = langid.classify(text)
+            lang_code, confidence = langid.classify(text[:self._classifier_max_chars])
             
             # Map to our supported languages
             if lang_code in self.supported_languages:
                 return LanguageDetectionResult(
                     detected_language=self.supported_languages[lang_code],
                     confidence=confidence,
-                    alternative_languages=[],
+                    alternative_languages=(),
                     language_code=lang_code,
                     is_reliable=confidence > 0.7
                 )
@@ -214,13 +440,18 @@ class LanguageDetector:
                 
         except Exception as e:
             logger.debug(f"LangID detection failed: {e}")
-            return self._detect_with_patterns(text)
+            # Through the memoized entry point, so repeated failures on a text don't rescan it
+            return self.detect_language(text, 'pattern')
     
     def _detect_with_langdetect(self, text: str) -> LanguageDetectionResult:
         """Detect language using langdetect library"""
+        sample = text[:self._classifier_max_chars]
         try:
             # Get all possible languages with probabilities
-            languages = detect_langs(text)
+            if self._langdetect_factory is not None:
+                languages = self._langdetect_detector(sample).get_probabilities()
+            else:
+                languages = detect_langs(sample)
             
             if languages:
                 # Find the best match among our supported languages
@@ -250,12 +481,15 @@ class LanguageDetector:
             
             # Fallback to single detection
             try:
-                lang_code = detect(text)
+                if self._langdetect_factory is not None:
+                    lang_code = self._langdetect_detector(sample).detect()
+                else:
+                    lang_code = detect(sample)
                 if lang_code in self.supported_languages:
                     return LanguageDetectionResult(
                         detected_language=self.supported_languages[lang_code],
                         confidence=0.8,  # Default confidence
-                        alternative_languages=[],
+                        alternative_languages=(),
                         language_code=lang_code,
                         is_reliable=True
                     )
@@ -265,28 +499,25 @@ class LanguageDetector:
         except Exception as e:
             logger.debug(f"LangDetect detection failed: {e}")
         
-        return self._detect_with_patterns(text)
+        return self.detect_language(text, 'pattern')
     
     def _detect_with_patterns(self, text: str) -> LanguageDetectionResult:
         """Detect language using character set patterns"""
-        scores = {}
-        
-        for lang_code, pattern in self.language_patterns.items():
-            matches = len(re.findall(pattern, text))
-            if len(text) > 0:
-                scores[lang_code] = matches / len(text)
-            else:
-                scores[lang_code] = 0.0
+        # Codepoints as a uint32 array (utf-32 has no BOM with an explicit byte order)
+        return self._patterns_from_cps(np.frombuffer(text.encode('utf-32-le'), dtype=np.uint32))
+    
+    def _patterns_from_cps(self, cps: np.ndarray) -> LanguageDetectionResult:
+        """Pattern detection over the text's precomputed uint32 codepoints"""
+        # Count codepoints per script bin in one pass, then read each language's bin
+        if cps.size > 0:
+            bins = np.bincount(self._script_lut[cps[cps < self._script_lut.size]], minlength=self._script_nbins)
+            fractions = (bins[self._lang_script_bin] / cps.size).tolist()
+        else:
+            fractions = [0.0] * len(self._lang_script_bin)
+        scores = dict(zip(self._lang_codes, fractions))
         
         if scores:
-            best_lang = max(scores, key=scores.get)
-            best_score = scores[best_lang]
-            
-            # Get alternatives
-            alternatives = []
-            for lang_code, score in sorted(scores.items(), key=lambda x: x[1], reverse=True)[1:4]:
-                if score > 0.1:  # Only include reasonable alternatives
-                    alternatives.append((self.supported_languages[lang_code], score))
+            best_lang, best_score, alternatives = self._rank_scores(scores, 0.1)
             
             return LanguageDetectionResult(
                 detected_language=self.supported_languages[best_lang],
@@ -296,51 +527,77 @@ class LanguageDetector:
                 is_reliable=best_score > 0.3
             )
         
-        return LanguageDetectionResult(
-            detected_language='Unknown',
-            confidence=0.0,
-            alternative_languages=[],
-            language_code='unknown',
-            is_reliable=False
-        )
+        return _UNKNOWN_RESULT
+    
+    def _rank_scores(self, scores: Dict[str, float], min_alternative: float):
+        """Best language, its score and up to 3 alternatives above min_alternative"""
+        values = np.array([scores[code] for code in self._lang_codes])
+        # Stable descending sort, so ties resolve in supported_languages order as max() did
+        order = np.argsort(-values, kind='stable')
+        alternatives = [(self._lang_names[i], float(values[i])) for i in order[1:4]
+                        if values[i] > min_alternative]
+        best = order[0]
+        return self._lang_codes[best], float(values[best]), alternatives
     
     def _detect_with_features(self, text: str) -> LanguageDetectionResult:
         """Detect language using language-specific features"""
+        return self._features_from_cps(None, text.lower(), len(text))
+    
+    def _features_from_cps(self, cps_lower: Optional[np.ndarray], text_lower: str,
+                           n_chars: int) -> LanguageDetectionResult:
+        """
+        Feature detection over the lowercased text
+        
+        cps_lower are its uint32 codepoints if already encoded (encoded here only when the
+        histogram path needs them); n_chars is the length of the original text
+        """
         scores = {}
         
-        for lang_code, features in self.language_features.items():
+        # One codepoint histogram scores every language's frequencies at once (long texts only)
+        char_scores = None
+        if n_chars >= self._feature_hist_min_chars:
+            if cps_lower is None:
+                cps_lower = np.frombuffer(text_lower.encode('utf-32-le'), dtype=np.uint32)
+            hist = np.bincount(np.minimum(cps_lower, self._feature_max_cp), minlength=self._feature_max_cp + 1)
+            observed = hist[self._feature_cps] / n_chars
+            if _char_score_kernel is not None:
+                char_scores = _char_score_kernel(self._feature_exp, observed)
+            else:
+                char_scores = (1 - np.abs(self._feature_exp - observed)).mean(axis=1)
+        
+        # Single pass for all common words; each distinct word counts once, as with `in`
+        word_counts = None
+        if self._word_automaton is not None:
+            word_counts = Counter()
+            for word, langs in {value for _, value in self._word_automaton.iter(text_lower)}:
+                word_counts.update(langs)
+        
+        for i, (lang_code, features) in enumerate(self.language_features.items()):
             score = 0.0
             
             # Check common words
-            text_lower = text.lower()
-            word_matches = sum(1 for word in features['common_words'] if word in text_lower)
+            if word_counts is not None:
+                word_matches = word_counts[lang_code]
+            else:
+                word_matches = sum(1 for word in features['common_words'] if word in text_lower)
             word_score = word_matches / len(features['common_words'])
             
             # Check character frequency
             char_score = 0.0
-            if len(text) > 0:
-                char_counts = Counter(text.lower())
-                total_chars = len(text)
-                
-                for char, expected_freq in features['character_freq'].items():
-                    actual_freq = char_counts.get(char, 0) / total_chars
-                    char_score += 1 - abs(expected_freq - actual_freq)
-                
-                char_score /= len(features['character_freq'])
+            if char_scores is not None:
+                char_score = float(char_scores[i])
+            elif n_chars > 0:
+                inv = 1.0 / n_chars
+                chars = self._feature_chars[lang_code]
+                char_score = sum(1 - abs(expected_freq - text_lower.count(char) * inv)
+                                 for char, expected_freq in chars) / len(chars)
             
             # Combined score
             score = (word_score * 0.6) + (char_score * 0.4)
             scores[lang_code] = score
         
         if scores:
-            best_lang = max(scores, key=scores.get)
-            best_score = scores[best_lang]
-            
-            # Get alternatives
-            alternatives = []
-            for lang_code, score in sorted(scores.items(), key=lambda x: x[1], reverse=True)[1:4]:
-                if score > 0.1:
-                    alternatives.append((self.supported_languages[lang_code], score))
+            best_lang, best_score, alternatives = self._rank_scores(scores, 0.1)
             
             return LanguageDetectionResult(
                 detected_language=self.supported_languages[best_lang],
@@ -350,13 +607,7 @@ class LanguageDetector:
                 is_reliable=best_score > 0.4
             )
         
-        return LanguageDetectionResult(
-            detected_language='Unknown',
-            confidence=0.0,
-            alternative_languages=[],
-            language_code='unknown',
-            is_reliable=False
-        )
+        return _UNKNOWN_RESULT
     
     def _find_closest_language(self, detected_lang: str, confidence: float) -> LanguageDetectionResult:
         """Find the closest supported language to the detected one"""
@@ -376,7 +627,7 @@ class LanguageDetector:
             return LanguageDetectionResult(
                 detected_language=self.supported_languages[mapped_lang],
                 confidence=confidence * 0.8,  # Reduce confidence due to mapping
-                alternative_languages=[],
+                alternative_languages=(),
                 language_code=mapped_lang,
                 is_reliable=confidence > 0.8
             )
@@ -385,33 +636,50 @@ class LanguageDetector:
         return LanguageDetectionResult(
             detected_language='English',
             confidence=0.5,
-            alternative_languages=[],
+            alternative_languages=(),
             language_code='en',
             is_reliable=False
         )
     
-    def batch_detect(self, texts: List[str], method: str = 'ensemble') -> List[LanguageDetectionResult]:
-        """Detect languages for multiple texts"""
-        results = []
-        
-        for text in texts:
-            try:
-                result = self.detect_language(text, method)
-                results.append(result)
-            except Exception as e:
-                logger.error(f"Language detection failed for text: {e}")
-                # Create unknown result
-                unknown_result = LanguageDetectionResult(
-                    detected_language='Unknown',
-                    confidence=0.0,
-                    alternative_languages=[],
-                    language_code='unknown',
-                    is_reliable=False
-                )
-                results.append(unknown_result)
-        
+    def batch_detect(self, texts: List[str], method: str = 'ensemble',
+                     workers: Optional[int] = None) -> List[LanguageDetectionResult]:
+        """Detect languages for multiple texts, across worker processes for large batches"""
+        # Blank texts resolve to the shared unknown result without reaching a detector
+        results = [_UNKNOWN_RESULT] * len(texts)
+        pending = [i for i, text in enumerate(texts) if text and not text.isspace()]
+        
+        if len(pending) >= BATCH_POOL_MIN_TEXTS:
+            workers = workers or os.cpu_count() or 1
+            if workers > 1:
+                try:
+                    # Scoped to this call: the shared get_default_detector() instance would
+                    # otherwise keep idle worker processes alive for the life of the process
+                    with ProcessPoolExecutor(
+                        max_workers=workers, initializer=_init_worker, initargs=(self.use_langdetect,)
+                    ) as pool:
+                        detected = pool.map(
+                            _worker,
+                            [(texts[i], method) for i in pending],
+                            chunksize=max(1, len(pending) // (workers * 4))
+                        )
+                        for i, result in zip(pending, detected):
+                            results[i] = result
+                    return results
+                except Exception as e:
+                    logger.warning(f"Process pool language detection failed, running serially: {e}")
+        
+        for i in pending:
+            results[i] = self._detect_one(texts[i], method)
         return results
     
+    def _detect_one(self, text: str, method: str) -> LanguageDetectionResult:
+        """detect_language that reports failures as an unknown result"""
+        try:
+            return self.detect_language(text, method)
+        except Exception as e:
+            logger.error(f"Language detection failed for text: {e}")
+            return _UNKNOWN_RESULT
+    
     def calculate_metrics(self, predictions: List[str], ground_truth: List[str]) -> LanguageMetrics:
         """
         Calculate language detection performance metrics
@@ -426,49 +694,30 @@ class LanguageDetector:
         if len(predictions) != len(ground_truth):
             raise ValueError("Predictions and ground truth must have same length")
         
-        # Initialize confusion matrix
-        confusion_matrix = {lang: {other_lang: 0 for other_lang in self.supported_languages.keys()} 
-                           for lang in self.supported_languages.keys()}
-        
-        # Fill confusion matrix
-        for pred, gt in zip(predictions, ground_truth):
-            if pred in self.supported_languages and gt in self.supported_languages:
-                confusion_matrix[gt][pred] += 1
+        # Confusion matrix over integer-encoded labels (rows: ground truth, cols: predicted)
+        langs = self._lang_codes
+        label_to_idx = self._lang_index
+        y_true = np.fromiter((label_to_idx.get(gt, -1) for gt in ground_truth), dtype=np.intp, count=len(ground_truth))
+        y_pred = np.fromiter((label_to_idx.get(pred, -1) for pred in predictions), dtype=np.intp, count=len(predictions))
+        known = (y_true >= 0) & (y_pred >= 0)
+        cm = np.zeros((len(langs), len(langs)), dtype=np.int64)
+        np.add.at(cm, (y_true[known], y_pred[known]), 1)
+        
+        # Per-language counts; languages with no predictions (or no samples) contribute 0
+        tp = np.diag(cm)
+        fp = cm.sum(axis=0) - tp
+        fn = cm.sum(axis=1) - tp
+        precision = tp / np.maximum(tp + fp, 1)
+        recall = tp / np.maximum(tp + fn, 1)
         
-        # Calculate metrics for each language
-        total_correct = 0
+        # Overall metrics
         total_predictions = len(predictions)
+        accuracy = int(tp.sum()) / total_predictions if total_predictions > 0 else 0
+        avg_precision = float(precision.mean())
+        avg_recall = float(recall.mean())
         
-        precision_sum = 0
-        recall_sum = 0
-        
-        for lang_code in self.supported_languages.keys():
-            # True positives
-            tp = confusion_matrix[lang_code][lang_code]
-            
-            # False positives (predicted as this language but actually different)
-            fp = sum(confusion_matrix[other_lang][lang_code] for other_lang in self.supported_languages.keys() 
-                    if other_lang != lang_code)
-            
-            # False negatives (actually this language but predicted as different)
-            fn = sum(confusion_matrix[lang_code][other_lang] for other_lang in self.supported_languages.keys() 
-                    if other_lang != lang_code)
-            
-            total_correct += tp
-            
-            # Calculate precision and recall for this language
-            if tp + fp > 0:
-                precision = tp / (tp + fp)
-                precision_sum += precision
-            
-            if tp + fn > 0:
-                recall = tp / (tp + fn)
-                recall_sum += recall
-        
-        # Overall metrics
-        accuracy = total_correct / total_predictions if total_predictions > 0 else 0
-        avg_precision = precision_sum / len(self.supported_languages)
-        avg_recall = recall_sum / len(self.supported_languages)
+        # Nested-dict view kept for callers of LanguageMetrics.confusion_matrix
+        confusion_matrix = {gt: dict(zip(langs, row)) for gt, row in zip(langs, cm.tolist())}
         
         # F1-score
         if avg_precision + avg_recall > 0:
@@ -483,3 +732,19 @@ class LanguageDetector:
             f1_score=f1_score,
             confusion_matrix=confusion_matrix
         )
+
+def get_default_detector() -> LanguageDetector:
+    """
+    Shared LanguageDetector for callers that don't need their own configuration
+    
+    Preferred entry point for pipelines: langid/langdetect initialization and profile
+    loading happen once per process instead of per instance. Detection is safe to call
+    from multiple threads, since the detector's state is not modified after __init__
+    apart from the thread-safe result cache.
+    """
+    global _default_detector
+    if _default_detector is None:
+        with _default_detector_lock:
+            if _default_detector is None:
+                _default_detector = LanguageDetector()
+    return _default_detector
@@ -1,27 +1,42 @@
 """Line detector wrapper: CRAFT/DBNet-style detection skeleton."""
 import cv2
 import logging
+import numpy as np
 
-def detect_lines(image):
+logger = logging.getLogger(__name__)
+
+# Structure-of-arrays layout for detections; legacy=False callers get this directly
+LINE_DTYPE = np.dtype([('x0', 'i4'), ('y0', 'i4'), ('w', 'i4'), ('h', 'i4'), ('score', 'f4')])
+
+def detect_lines(image, legacy=True):
     try:
         h, w = image.shape[:2]
-        logging.info(f"Running line detection on image of size {w}x{h}")
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(f"Running line detection on image of size {w}x{h}")
         step = max(32, h // 10)
-        out = []
-        for y in range(0, h, step):
-            out.append({
+        ys = np.arange(0, h, step, dtype=np.int32)
+        recs = np.zeros(ys.size, dtype=LINE_DTYPE)
+        recs['y0'] = ys
+        recs['w'] = w
+        recs['h'] = np.minimum(step, h - ys)
+        recs['score'] = 0.99
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(f"Detected {recs.size} text lines.")
+        if not legacy:
+            return recs
+        return [
+            {
                 "label": "TextLine",
-                "bbox": [0, y, w, min(step, h - y)],
+                "bbox": [0, y, w, lh],
                 "score": 0.99,
                 "text": f"Line at y={y}",
                 "lang": "en"
-            })
-        logging.info(f"Detected {len(out)} text lines.")
-        return out
+            }
+            for y, lh in zip(ys.tolist(), recs['h'].tolist())
+        ]
     except Exception as e:
-        logging.error(f"Error in line detection: {e}")
-        return []
+        logger.error(f"Error in line detection: {e}")
+        return [] if legacy else np.zeros(0, dtype=LINE_DTYPE)
 if __name__ == '__main__':
-    import numpy as np
     img = 255*np.ones((800,600,3), dtype='uint8')
     print('Detections:', detect_lines(img))
@@ -5,20 +5,239 @@ Provides text extraction with CER/WER metrics
 """
 
 import cv2
+import hashlib
+import inspect
 import numpy as np
-from typing import Dict, List, Tuple, Optional
+from typing import Dict, Iterable, List, Tuple, Optional, Union
 import logging
+import os
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from PIL import Image
 import easyocr
 import torch
 from transformers import TrOCRProcessor, VisionEncoderDecoderModel
+from transformers.modeling_outputs import BaseModelOutput
 import re
 
+try:
+    import numba
+except ImportError:
+    numba = None
+
+try:
+    import pytesseract
+except ImportError:
+    pytesseract = None
+
+try:
+    from rapidfuzz import process as rf_process
+    from rapidfuzz.distance import Levenshtein
+except ImportError:
+    rf_process = None
+    Levenshtein = None
+
+from .trt_session import TRTInferSession, TRTRecognizer, export_recognizer_onnx, RECOGNIZER_HEIGHT
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Text clean-up patterns, compiled once rather than looked up in re's cache per region
+_RE_WS = re.compile(r'\s+')
+_RE_ARTIFACTS = re.compile(r'[^\w\s\u0600-\u06FF\u0900-\u097F\u0750-\u077F\u08A0-\u08FF\uFB50-\uFDFF\uFE70-\uFEFF]')
+
+# Script block boundaries for one searchsorted pass over a region's codepoints. Bin i
+# holds codepoints in [edge[i-1], edge[i]); the bins named below are the blocks counted
+_SCRIPT_EDGES = np.array([0x600, 0x700, 0x750, 0x780, 0x8A0, 0x900, 0x980,
+                          0xFB50, 0xFE00, 0xFE70, 0xFF00], dtype=np.uint32)
+_BIN_ARABIC, _BIN_ARABIC_SUP, _BIN_ARABIC_EXT_A, _BIN_DEVANAGARI = 1, 3, 5, 6
+_BIN_PRES_FORMS_A, _BIN_PRES_FORMS_B = 8, 10
+
+# Single-line Tesseract restricted to numeric characters, for digit_route crops
+_DIGIT_TESSERACT_CONFIG = '--psm 7 -c tessedit_char_whitelist=0123456789.,$%'
+# Below this mean Tesseract confidence (0-1) a digit-strip crop still goes to EasyOCR
+DIGIT_ROUTE_MIN_CONFIDENCE = 0.8
+
+# TrOCR encoder outputs kept per crop (~0.9 MB each for trocr-base in FP16)
+TROCR_ENCODER_CACHE_SIZE = 64
+
+if numba is not None:
+    @numba.njit(cache=True)
+    def _count_scripts(codepoints):
+        """(Arabic block, other Arabic blocks, Presentation Forms-A, Devanagari) counts in one pass"""
+        arabic = arabic_other = forms_a = devanagari = 0
+        for cp in codepoints:
+            if 0x0600 <= cp <= 0x06FF:
+                arabic += 1
+            elif 0x0900 <= cp <= 0x097F:
+                devanagari += 1
+            elif 0xFB50 <= cp <= 0xFDFF:
+                forms_a += 1
+            elif 0x0750 <= cp <= 0x077F or 0x08A0 <= cp <= 0x08FF or 0xFE70 <= cp <= 0xFEFF:
+                arabic_other += 1
+        return arabic, arabic_other, forms_a, devanagari
+else:
+    _count_scripts = None
+
+def _levenshtein(a, b) -> int:
+    """Edit distance between two sequences (fallback when rapidfuzz is not installed)"""
+    if len(a) < len(b):
+        a, b = b, a
+    previous = list(range(len(b) + 1))
+    for i, x in enumerate(a, 1):
+        current = [i]
+        for j, y in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (x != y)))
+        previous = current
+    return previous[-1]
+
+def _pairwise_edit_distances(predictions: List, references: List) -> List[int]:
+    """Levenshtein distance of each (prediction, reference) pair; strings or token lists"""
+    if Levenshtein is None:
+        return [_levenshtein(p, r) for p, r in zip(predictions, references)]
+    if hasattr(rf_process, 'cpdist') and len(predictions) > 1:
+        # rapidfuzz >= 3.6: element-wise distances over all cores in one call
+        return rf_process.cpdist(predictions, references, scorer=Levenshtein.distance, workers=-1).tolist()
+    return [Levenshtein.distance(p, r) for p, r in zip(predictions, references)]
+
+def _to_half_channels_last(x):
+    """Floating-point tensors to FP16 (4-D ones channels-last); anything else unchanged"""
+    if not isinstance(x, torch.Tensor) or not x.is_floating_point():
+        return x
+    x = x.half()
+    return x.contiguous(memory_format=torch.channels_last) if x.dim() == 4 else x
+
+def _to_float(x):
+    """FP16 outputs (possibly nested in tuples/lists) back to FP32 for EasyOCR's post-processing"""
+    if isinstance(x, torch.Tensor):
+        return x.float() if x.is_floating_point() else x
+    if isinstance(x, (tuple, list)):
+        return type(x)(_to_float(item) for item in x)
+    return x
+
+class _HalfChannelsLast(torch.nn.Module):
+    """Runs an EasyOCR network in FP16 channels-last; callers keep passing/receiving FP32 NCHW"""
+    
+    def __init__(self, module: torch.nn.Module):
+        super().__init__()
+        self.module = module.half().to(memory_format=torch.channels_last)
+    
+    def forward(self, *args, **kwargs):
+        args = [_to_half_channels_last(arg) for arg in args]
+        kwargs = {key: _to_half_channels_last(value) for key, value in kwargs.items()}
+        return _to_float(self.module(*args, **kwargs))
+
+class _PinnedDetector(torch.nn.Module):
+    """
+    EasyOCR detector that receives its input batch on the host and moves it to the
+    device itself, staged through a reused page-locked buffer (async DMA instead of a
+    pageable copy). EasyOCR is told to leave the batch on the CPU by _pinned_get_textbox.
+    """
+    
+    def __init__(self, module: torch.nn.Module, device: str):
+        super().__init__()
+        self.module = module
+        self.device = device
+        self._pinned: Optional[torch.Tensor] = None
+        self._copied: Optional[torch.cuda.Event] = None
+        self._lock = threading.Lock()
+    
+    def forward(self, x, *args, **kwargs):
+        if x.device.type == 'cpu':
+            with self._lock:
+                if self._copied is not None:
+                    self._copied.synchronize()  # previous transfer must finish before the buffer is reused
+                if self._pinned is None or self._pinned.numel() < x.numel() or self._pinned.dtype != x.dtype:
+                    self._pinned = torch.empty(x.numel(), dtype=x.dtype, pin_memory=True)
+                staged = self._pinned[:x.numel()].view(x.shape)
+                staged.copy_(x)
+                x = staged.to(self.device, non_blocking=True)
+                self._copied = torch.cuda.Event()
+                self._copied.record()
+        return self.module(x, *args, **kwargs)
+
+def _pinned_get_textbox(get_textbox):
+    """
+    Wrap a Reader's get_textbox so a _PinnedDetector is handed its batch on the CPU
+
+    Installed per Reader (on its `get_textbox` attribute), so other EasyOCR readers in
+    the process keep the stock behaviour.
+    """
+    # Position of `device` in get_textbox's signature, resolved once rather than per call
+    device_index = list(inspect.signature(get_textbox).parameters).index('device')
+    
+    def get_textbox_pinned(detector, *args, **kwargs):
+        if isinstance(detector, _PinnedDetector):
+            if len(args) >= device_index:
+                args = list(args)
+                args[device_index - 1] = 'cpu'
+            else:
+                kwargs['device'] = 'cpu'
+        return get_textbox(detector, *args, **kwargs)
+    
+    return get_textbox_pinned
+
+class _ActiveRowProjection(torch.nn.Module):
+    """LM head that only projects rows still decoding; finished rows get zero logits"""
+    
+    def __init__(self, proj: torch.nn.Module, state: Dict):
+        super().__init__()
+        self.proj = proj
+        self.state = state  # shared with FastTrOCRModel; holds the per-row finished mask
+    
+    @property
+    def weight(self):
+        return self.proj.weight
+    
+    def forward(self, hidden_states):
+        finished = self.state.get('finished')
+        if finished is None or not bool(finished.any()) or finished.shape[0] != hidden_states.shape[0]:
+            return self.proj(hidden_states)
+        active = (~finished).nonzero().squeeze(1)
+        active_logits = self.proj(hidden_states[active])
+        logits = active_logits.new_zeros((hidden_states.shape[0],) + tuple(active_logits.shape[1:]))
+        logits[active] = active_logits
+        return logits
+
+class FastTrOCRModel(VisionEncoderDecoderModel):
+    """
+    VisionEncoderDecoderModel whose decoder LM head skips sequences that already ended
+    
+    During generate() the last decoder token of each row is tracked; once a row has
+    produced EOS (or PAD afterwards) its vocabulary projection is no longer computed.
+    generate() overwrites those rows with PAD anyway, so outputs are unchanged.
+    """
+    
+    def generate(self, *args, **kwargs):
+        head = self.decoder.get_output_embeddings()
+        if not isinstance(head, _ActiveRowProjection):
+            self._decode_state = {}
+            self.decoder.set_output_embeddings(_ActiveRowProjection(head, self._decode_state))
+        self._decode_state.update(finished=None, step=0)
+        try:
+            return super().generate(*args, **kwargs)
+        finally:
+            self._decode_state.update(finished=None, step=None)
+    
+    def forward(self, *args, decoder_input_ids=None, **kwargs):
+        state = getattr(self, '_decode_state', None)
+        if state is not None and state.get('step') is not None and decoder_input_ids is not None:
+            # The first step's token is decoder_start (== EOS for TrOCR), so it is skipped
+            if state['step'] > 0:
+                config = getattr(self, 'generation_config', None) or self.config
+                eos = config.eos_token_id
+                stop_ids = list(eos) if isinstance(eos, (list, tuple)) else [eos]
+                stop_ids = [i for i in stop_ids + [config.pad_token_id] if i is not None]
+                last = decoder_input_ids[:, -1]
+                done = torch.isin(last, torch.tensor(stop_ids, device=last.device))
+                state['finished'] = done if state['finished'] is None else state['finished'] | done
+            state['step'] += 1
+        return super().forward(*args, decoder_input_ids=decoder_input_ids, **kwargs)
+
 @dataclass
 class TextRegion:
     """Represents a detected text region with metadata"""
@@ -36,15 +255,88 @@ class OCRResult:
     detected_languages: List[str]
     processing_time: float
 
+# Language codes stored in OCRBatch.langs, by index. The last entry is reserved: any
+# code outside the table (a langdetect result, 'unknown', ...) is stored as 'unknown'
+LANG_TABLE = ('en', 'hi', 'ur', 'ar', 'ne', 'fa', 'unknown')
+UNKNOWN_IDX = len(LANG_TABLE) - 1
+_LANG_INDEX = {code: i for i, code in enumerate(LANG_TABLE)}
+
+@dataclass
+class OCRBatch:
+    """
+    Structure-of-arrays OCR output for several pages
+    
+    Regions of page b are rows page_offsets[b]:page_offsets[b+1] of every per-region
+    array, in the same order as OCRResult.text_regions. regions(b) and results()
+    rebuild the TextRegion/OCRResult objects for code that still wants them.
+    """
+    bboxes: np.ndarray                # (N, 4) float32 [x, y, w, h]
+    texts: List[str]                  # (N,)
+    confidences: np.ndarray           # (N,) float32
+    langs: np.ndarray                 # (N,) uint8 index into LANG_TABLE
+    language_confidences: np.ndarray  # (N,) float32
+    page_offsets: np.ndarray          # (B+1,) int32
+    processing_times: np.ndarray      # (B,) float32
+    
+    def __len__(self) -> int:
+        return len(self.page_offsets) - 1
+    
+    @classmethod
+    def from_results(cls, results: List[OCRResult]) -> 'OCRBatch':
+        regions = [region for result in results for region in result.text_regions]
+        page_offsets = np.zeros(len(results) + 1, dtype=np.int32)
+        np.cumsum([len(result.text_regions) for result in results], out=page_offsets[1:])
+        return cls(
+            bboxes=np.array([region.bbox for region in regions], dtype=np.float32).reshape(-1, 4),
+            texts=[region.text for region in regions],
+            confidences=np.array([region.confidence for region in regions], dtype=np.float32),
+            langs=np.array([_LANG_INDEX.get(region.language, UNKNOWN_IDX) for region in regions], dtype=np.uint8),
+            language_confidences=np.array([region.language_confidence for region in regions], dtype=np.float32),
+            page_offsets=page_offsets,
+            processing_times=np.array([result.processing_time for result in results], dtype=np.float32)
+        )
+    
+    def regions(self, b: int) -> List[TextRegion]:
+        """TextRegion objects for page b"""
+        start, end = int(self.page_offsets[b]), int(self.page_offsets[b + 1])
+        return [
+            TextRegion(bbox=bbox, text=text, confidence=confidence,
+                       language=LANG_TABLE[lang], language_confidence=language_confidence)
+            for bbox, text, confidence, lang, language_confidence in zip(
+                self.bboxes[start:end].tolist(), self.texts[start:end],
+                self.confidences[start:end].tolist(), self.langs[start:end].tolist(),
+                self.language_confidences[start:end].tolist()
+            )
+        ]
+    
+    def results(self) -> List[OCRResult]:
+        """OCRResult per page, as returned by batch_extract(legacy=True)"""
+        out = []
+        for b in range(len(self)):
+            text_regions = self.regions(b)
+            out.append(OCRResult(
+                text_regions=text_regions,
+                overall_text=" ".join(region.text for region in text_regions),
+                detected_languages=list(set(region.language for region in text_regions)),
+                processing_time=float(self.processing_times[b])
+            ))
+        return out
+
 class MultilingualOCR:
     """
     Multilingual OCR system supporting 6 languages:
     English, Hindi, Urdu, Arabic, Nepalese, Persian
     """
     
-    def __init__(self, use_gpu: bool = True):
+    def __init__(self, use_gpu: bool = True, trt_recognizer_onnx: Optional[str] = None,
+                 digit_route: bool = False):
         self.use_gpu = use_gpu and torch.cuda.is_available()
+        # Numeric single-line crops go to Tesseract (digit whitelist) before EasyOCR
+        self.digit_route = digit_route and pytesseract is not None
+        if digit_route and pytesseract is None:
+            logger.warning("pytesseract is not installed; digit_route disabled")
         self.device = "cuda" if self.use_gpu else "cpu"
+        self._init_cuda_preprocess()
         
         # Initialize EasyOCR for multilingual support
         self.languages = ['en', 'hi', 'ur', 'ar', 'ne', 'fa']  # ISO codes
@@ -68,18 +360,90 @@ class MultilingualOCR:
         except Exception as e:
             logger.error(f"Failed to initialize EasyOCR: {e}")
             self.reader = None
+        
+        if trt_recognizer_onnx and self.reader is not None and self.use_gpu:
+            self._enable_trt_recognizer(trt_recognizer_onnx)
+        
+        if self.reader is not None and self.use_gpu:
+            # FP16 + channels-last only pays off on GPU tensor cores
+            self._enable_half_precision_reader()
+            self._enable_pinned_detector_input()
+        
+        if self.reader is not None and self.use_gpu:
+            # First batched calls pay for CUDA context/cuDNN autotuning; take that hit here
+            try:
+                warmup = [np.zeros((640, 640), dtype=np.uint8)] * 2
+                self.reader.readtext_batched(warmup, batch_size=2)
+            except Exception as e:
+                logger.warning(f"EasyOCR warmup failed: {e}")
             
-        # Initialize TrOCR as backup
+        # TrOCR is only a fallback; its weights are loaded on first use (_ensure_trocr)
+        self.trocr_processor = None
+        self.trocr_model = None
+        self._trocr_lock = threading.Lock()
+        self._trocr_load_failed = False
+        # Encoder hidden states by crop hash, LRU-ordered; the prefetch thread reads it too
+        self._trocr_encoder_cache = OrderedDict()
+        self._trocr_cache_lock = threading.Lock()
+    
+    def _ensure_trocr(self) -> bool:
+        """Load TrOCR on first use; False if it is unavailable (a failed load is not retried)"""
+        if self.trocr_model is not None:
+            return True
+        with self._trocr_lock:
+            if self.trocr_model is None and not self._trocr_load_failed:
+                try:
+                    processor = TrOCRProcessor.from_pretrained('microsoft/trocr-base-handwritten')
+                    model = FastTrOCRModel.from_pretrained(
+                        'microsoft/trocr-base-handwritten',
+                        torch_dtype=torch.float16 if self.use_gpu else torch.float32
+                    )
+                    if self.use_gpu:
+                        model.to(self.device)
+                    model.eval()
+                    self.trocr_processor = processor
+                    self.trocr_model = model
+                    logger.info("TrOCR model loaded successfully")
+                except Exception as e:
+                    logger.error(f"Failed to load TrOCR model: {e}")
+                    self._trocr_load_failed = True
+        return self.trocr_model is not None
+    
+    def _enable_trt_recognizer(self, onnx_path: str):
+        """Run EasyOCR's recognizer through a TensorRT FP16 engine, keeping PyTorch as fallback"""
         try:
-            self.trocr_processor = TrOCRProcessor.from_pretrained('microsoft/trocr-base-handwritten')
-            self.trocr_model = VisionEncoderDecoderModel.from_pretrained('microsoft/trocr-base-handwritten')
-            if self.use_gpu:
-                self.trocr_model.to(self.device)
-            logger.info("TrOCR model loaded successfully")
+            if not os.path.exists(onnx_path):
+                export_recognizer_onnx(self.reader.recognizer, onnx_path)
+            # Line crops are RECOGNIZER_HEIGHT px high; widths cover short words to full lines
+            session = TRTInferSession(
+                onnx_path,
+                shape_profile=((1, 1, RECOGNIZER_HEIGHT, 32),
+                               (16, 1, RECOGNIZER_HEIGHT, 512),
+                               (64, 1, RECOGNIZER_HEIGHT, 2048))
+            )
+            self.reader.recognizer = TRTRecognizer(session, self.reader.recognizer)
+            logger.info("EasyOCR recognizer running on TensorRT")
         except Exception as e:
-            logger.error(f"Failed to load TrOCR model: {e}")
-            self.trocr_processor = None
-            self.trocr_model = None
+            logger.warning(f"TensorRT recognizer unavailable, using EasyOCR's PyTorch model: {e}")
+    
+    def _enable_half_precision_reader(self):
+        """Run EasyOCR's detector and (PyTorch) recognizer in FP16 with channels-last layout"""
+        try:
+            self.reader.detector = _HalfChannelsLast(self.reader.detector)
+            if not isinstance(self.reader.recognizer, TRTRecognizer):  # TensorRT is FP16 already
+                self.reader.recognizer = _HalfChannelsLast(self.reader.recognizer)
+            logger.info("EasyOCR networks running in FP16 (channels-last)")
+        except Exception as e:
+            logger.warning(f"FP16 EasyOCR unavailable, keeping FP32: {e}")
+    
+    def _enable_pinned_detector_input(self):
+        """Stage EasyOCR's detector input through a pinned host buffer for the H2D copy"""
+        try:
+            get_textbox = _pinned_get_textbox(self.reader.get_textbox)
+            self.reader.detector = _PinnedDetector(self.reader.detector, self.device)
+            self.reader.get_textbox = get_textbox
+        except Exception as e:
+            logger.warning(f"Pinned detector input unavailable: {e}")
     
     def extract_text(self, image: np.ndarray, bbox: Optional[List[float]] = None) -> OCRResult:
         """
@@ -92,19 +456,18 @@ class MultilingualOCR:
         Returns:
             OCRResult with extracted text and metadata
         """
-        import time
         start_time = time.time()
         
-        if bbox:
-            # Extract region from image
-            x, y, w, h = [int(coord) for coord in bbox]
-            image = image[y:y+h, x:x+w]
-        
         # Preprocess image
-        processed_image = self._preprocess_image(image)
+        processed_image = self._preprocess_image(self._crop(image, bbox))
+        
+        # Numeric strips (table cells, amounts) can skip EasyOCR entirely
+        text_regions = self._extract_digit_strip(processed_image) if self.digit_route else None
         
         # Extract text using EasyOCR
-        if self.reader:
+        if text_regions is not None:
+            pass
+        elif self.reader:
             try:
                 results = self.reader.readtext(processed_image)
                 text_regions = self._process_easyocr_results(results)
@@ -117,14 +480,98 @@ class MultilingualOCR:
         # Post-process results
         text_regions = self._post_process_text_regions(text_regions)
         
+        return self._build_result(text_regions, time.time() - start_time)
+    
+    def _looks_like_digit_strip(self, gray: np.ndarray) -> bool:
+        """
+        Cheap shape test for a single line of digits
+        
+        Uses the vertical projection of the ink: a short, wide crop whose glyphs are
+        mostly separate narrow runs (digits are ~0.3-0.9 of the text height, while words
+        merge into wide runs) that span the full text height apart from small punctuation
+        (lowercase letters stop at the x-height or extend below the baseline).
+        """
+        h, w = gray.shape
+        if h < 8 or h > 96 or w < 2 * h:
+            return False
+        
+        _, ink = cv2.threshold(gray, 0, 1, cv2.THRESH_BINARY_INV + cv2.THRESH_OTSU)
+        if ink.mean() > 0.5:  # light text on a dark background
+            ink = 1 - ink
+        
+        text_rows = np.flatnonzero(ink.any(axis=1))
+        if text_rows.size == 0:
+            return False
+        text_height = int(text_rows[-1] - text_rows[0] + 1)
+        columns = ink.any(axis=0).astype(np.int8)
+        edges = np.flatnonzero(np.diff(np.concatenate(([0], columns, [0]))))
+        starts, ends = edges[0::2], edges[1::2]
+        if not 2 <= starts.size <= 24:
+            return False
+        widths = (ends - starts) / text_height
+        
+        # Vertical ink extent of each glyph run, relative to the whole line
+        heights = np.array([np.ptp(np.flatnonzero(ink[:, a:b].any(axis=1))) + 1
+                            for a, b in zip(starts.tolist(), ends.tolist())]) / text_height
+        glyphs = heights >= 0.35  # shorter runs are '.', ',' and the like
+        if np.count_nonzero(glyphs) < 2:
+            return False
+        
+        # Mean ink coverage inside the glyph columns separates strokes from solid blobs
+        stroke_density = ink[:, columns.astype(bool)].mean()
+        # A run as wide as two or three digits is allowed: bold digits often touch
+        return bool(0.25 <= np.median(widths[glyphs]) <= 1.0 and widths.max() < 2.5
+                    and (heights[glyphs] >= 0.85).all() and 0.15 <= stroke_density <= 0.6)
+    
+    def _extract_digit_strip(self, image: np.ndarray) -> Optional[List[TextRegion]]:
+        """Tesseract digit recognition for numeric strips; None means use the regular path"""
+        gray = image if image.ndim == 2 else cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+        if not self._looks_like_digit_strip(gray):
+            return None
+        try:
+            data = pytesseract.image_to_data(gray, config=_DIGIT_TESSERACT_CONFIG,
+                                             output_type=pytesseract.Output.DICT)
+        except Exception as e:
+            logger.debug(f"Tesseract digit recognition failed: {e}")
+            return None
+        
+        words = [i for i, (text, conf) in enumerate(zip(data['text'], data['conf']))
+                 if text.strip() and float(conf) >= 0]
+        if not words:
+            return None
+        text = " ".join(data['text'][i].strip() for i in words)
+        confidence = float(np.mean([float(data['conf'][i]) for i in words])) / 100.0
+        # Capitals can pass the shape test; forced into digits they read back poorly
+        if confidence < DIGIT_ROUTE_MIN_CONFIDENCE or not any(c.isdigit() for c in text):
+            return None
+        
+        x0 = min(data['left'][i] for i in words)
+        y0 = min(data['top'][i] for i in words)
+        x1 = max(data['left'][i] + data['width'][i] for i in words)
+        y1 = max(data['top'][i] + data['height'][i] for i in words)
+        return [TextRegion(
+            bbox=[float(x0), float(y0), float(x1 - x0), float(y1 - y0)],
+            text=text,
+            confidence=confidence,
+            language='en',  # digits carry no script information
+            language_confidence=0.8  # Placeholder
+        )]
+    
+    def _crop(self, image: np.ndarray, bbox: Optional[List[float]]) -> np.ndarray:
+        """Extract the [x, y, w, h] region from image (whole image without bbox)"""
+        if bbox:
+            x, y, w, h = [int(coord) for coord in bbox]
+            image = image[y:y+h, x:x+w]
+        return image
+    
+    def _build_result(self, text_regions: List[TextRegion], processing_time: float) -> OCRResult:
+        """Assemble an OCRResult from post-processed text regions"""
         # Combine all text
         overall_text = " ".join([region.text for region in text_regions])
         
         # Detect languages
         detected_languages = list(set([region.language for region in text_regions]))
         
-        processing_time = time.time() - start_time
-        
         return OCRResult(
             text_regions=text_regions,
             overall_text=overall_text,
@@ -132,48 +579,83 @@ class MultilingualOCR:
             processing_time=processing_time
         )
     
+    def _init_cuda_preprocess(self):
+        """Build the OpenCV CUDA CLAHE for `_preprocess_image` when OpenCV has a CUDA device"""
+        # cv2 CLAHE objects keep scratch buffers between calls and preprocessing runs in a
+        # thread pool, so the CPU path caches one per thread instead of sharing one
+        self._clahe_local = threading.local()
+        self._cuda_preprocess = False
+        if not self.use_gpu or not hasattr(cv2, 'cuda'):
+            return
+        try:
+            if cv2.cuda.getCudaEnabledDeviceCount() == 0:
+                return
+            self._gpu_clahe = cv2.cuda.createCLAHE(clipLimit=2.0, tileGridSize=(8, 8))
+            self._gpu_lock = threading.Lock()
+            self._cuda_preprocess = True
+            logger.info("Using OpenCV CUDA image preprocessing")
+        except cv2.error as e:
+            logger.warning(f"OpenCV CUDA preprocessing unavailable: {e}")
+    
+    def _clahe(self):
+        """This thread's CLAHE instance (createCLAHE allocates its LUT buffers once)"""
+        clahe = getattr(self._clahe_local, 'clahe', None)
+        if clahe is None:
+            clahe = self._clahe_local.clahe = cv2.createCLAHE(clipLimit=2.0, tileGridSize=(8, 8))
+        return clahe
+    
     def _preprocess_image(self, image: np.ndarray) -> np.ndarray:
-        """Preprocess image for better OCR performance"""
-        # Convert to grayscale if needed
-        if len(image.shape) == 3:
-            gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
-        else:
-            gray = image.copy()
-        
-        # Apply adaptive thresholding
-        binary = cv2.adaptiveThreshold(
-            gray, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, cv2.THRESH_BINARY, 11, 2
-        )
+        """
+        Enhance contrast with CLAHE on the LAB lightness channel
         
-        # Denoise
-        denoised = cv2.fastNlMeansDenoising(binary)
+        Colour images come back as BGR with only L equalized; grayscale images are
+        equalized directly. Binarization is left to EasyOCR's detector.
+        """
+        if self._cuda_preprocess:
+            try:
+                return self._preprocess_image_cuda(image)
+            except cv2.error as e:
+                logger.warning(f"CUDA preprocessing failed, using CPU path: {e}")
+                self._cuda_preprocess = False
         
-        # Enhance contrast
-        clahe = cv2.createCLAHE(clipLimit=2.0, tileGridSize=(8,8))
-        enhanced = clahe.apply(denoised)
+        if image.ndim == 2:
+            return self._clahe().apply(image)
         
-        return enhanced
+        l, a, b = cv2.split(cv2.cvtColor(image, cv2.COLOR_BGR2LAB))
+        l = self._clahe().apply(l)
+        return cv2.cvtColor(cv2.merge([l, a, b]), cv2.COLOR_LAB2BGR)
     
-    def _process_easyocr_results(self, results: List[Tuple]) -> List[TextRegion]:
-        """Process EasyOCR results into TextRegion objects"""
-        text_regions = []
-        
-        for (bbox, text, confidence) in results:
-            # Convert bbox format from EasyOCR to [x, y, w, h]
-            x_coords = [point[0] for point in bbox]
-            y_coords = [point[1] for point in bbox]
-            
-            x = min(x_coords)
-            y = min(y_coords)
-            w = max(x_coords) - x
-            h = max(y_coords) - y
+    def _preprocess_image_cuda(self, image: np.ndarray) -> np.ndarray:
+        """`_preprocess_image` on the GPU: one upload, LAB -> CLAHE(L) -> BGR, one download"""
+        with self._gpu_lock:
+            src = cv2.cuda_GpuMat()
+            src.upload(np.ascontiguousarray(image))
+            if image.ndim == 2:
+                return self._gpu_clahe.apply(src, cv2.cuda.Stream_Null()).download()
             
+            l, a, b = cv2.cuda.split(cv2.cuda.cvtColor(src, cv2.COLOR_BGR2LAB))
+            l = self._gpu_clahe.apply(l, cv2.cuda.Stream_Null())
+            return cv2.cuda.cvtColor(cv2.cuda.merge([l, a, b]), cv2.COLOR_LAB2BGR).download()
+    
+    def _process_easyocr_results(self, results: List[Tuple],
+                                 scale: Tuple[float, float] = (1.0, 1.0)) -> List[TextRegion]:
+        """Process EasyOCR results into TextRegion objects, scaling boxes by (sx, sy)"""
+        if not results:
+            return []
+        
+        # Convert bbox format from EasyOCR (4 corner points) to [x, y, w, h] for all boxes at once
+        corners = np.asarray([bbox for bbox, _, _ in results], dtype=np.float64) * scale  # (N, 4, 2)
+        mins = corners.min(axis=1)
+        xywh = np.concatenate([mins, corners.max(axis=1) - mins], axis=1).tolist()
+        
+        text_regions = []
+        for box, (_, text, confidence) in zip(xywh, results):
             # Detect language (simplified - EasyOCR doesn't provide language detection)
-            # We'll use a simple heuristic based on character sets
-            detected_lang = self._detect_language_from_text(text)
+            # We'll use a simple heuristic based on character sets; ASCII text is always English
+            detected_lang = 'en' if text.isascii() else self._detect_language_from_text(text)
             
             text_region = TextRegion(
-                bbox=[x, y, w, h],
+                bbox=box,
                 text=text.strip(),
                 confidence=confidence,
                 language=detected_lang,
@@ -185,44 +667,123 @@ class MultilingualOCR:
     
     def _extract_with_trocr(self, image: np.ndarray) -> List[TextRegion]:
         """Extract text using TrOCR as fallback"""
-        if not self.trocr_processor or not self.trocr_model:
-            return []
+        return self._extract_with_trocr_batched([image])[0]
+    
+    def _extract_with_trocr_batched(self, images: List[np.ndarray],
+                                    batch_size: int = 16) -> List[List[TextRegion]]:
+        """
+        TrOCR over many images, one encoder pass and generate() call per batch_size chunk
         
-        try:
-            # Convert numpy array to PIL Image
-            pil_image = Image.fromarray(image)
-            
-            # Process image
-            pixel_values = self.trocr_processor(pil_image, return_tensors="pt").pixel_values
+        The processor (PIL resize + normalize, on the CPU) prepares the next chunk in a
+        background thread while the current one generates; on GPU its output is pinned
+        so the host-to-device copy is asynchronous. Encoder outputs are cached by crop
+        content, so crops seen recently (retries, re-evaluation) skip the encoder.
+        """
+        if not images or not self._ensure_trocr():
+            return [[] for _ in images]
+        
+        chunks = [images[start:start + batch_size] for start in range(0, len(images), batch_size)]
+        text_regions = []
+        with ThreadPoolExecutor(max_workers=1) as prep:
+            upcoming = prep.submit(self._trocr_prepare, chunks[0]) if chunks else None
+            for k, chunk in enumerate(chunks):
+                current = upcoming
+                upcoming = prep.submit(self._trocr_prepare, chunks[k + 1]) if k + 1 < len(chunks) else None
+                try:
+                    keys, misses, pixel_values = current.result()
+                    
+                    # Generate text (greedy, KV-cached) from the cached/fresh encoder states
+                    with torch.inference_mode():
+                        hidden = self._trocr_encode(chunk, keys, misses, pixel_values)
+                        generated_ids = self.trocr_model.generate(
+                            encoder_outputs=BaseModelOutput(last_hidden_state=hidden),
+                            use_cache=True, num_beams=1
+                        )
+                    generated_texts = self.trocr_processor.batch_decode(generated_ids, skip_special_tokens=True)
+                    
+                    # Create a single text region for each entire image
+                    for image, generated_text in zip(chunk, generated_texts):
+                        text_regions.append([TextRegion(
+                            bbox=[0, 0, image.shape[1], image.shape[0]],
+                            text=generated_text,
+                            confidence=0.7,  # Placeholder
+                            language='en',  # TrOCR is primarily English
+                            language_confidence=0.6
+                        )])
+                    
+                except Exception as e:
+                    logger.error(f"TrOCR extraction failed: {e}")
+                    text_regions.extend([] for _ in chunk)
+        
+        return text_regions
+    
+    def _trocr_prepare(self, chunk: List[np.ndarray]) -> Tuple[List[bytes], List[int], Optional[torch.Tensor]]:
+        """Cache keys for a chunk, plus processor output for the rows not in the encoder cache"""
+        keys = [self._crop_key(image) for image in chunk]
+        with self._trocr_cache_lock:
+            misses = [j for j, key in enumerate(keys) if key not in self._trocr_encoder_cache]
+        pixel_values = self._trocr_pixel_values([chunk[j] for j in misses]) if misses else None
+        return keys, misses, pixel_values
+    
+    def _trocr_encode(self, chunk: List[np.ndarray], keys: List[bytes], misses: List[int],
+                      pixel_values: Optional[torch.Tensor]) -> torch.Tensor:
+        """(N, seq, hidden) encoder states for a chunk, running the encoder only on cache misses"""
+        rows = [None] * len(chunk)
+        with self._trocr_cache_lock:
+            for j, key in enumerate(keys):
+                cached = self._trocr_encoder_cache.get(key)
+                if cached is not None:
+                    self._trocr_encoder_cache.move_to_end(key)
+                    rows[j] = cached
+        
+        missing = [j for j, row in enumerate(rows) if row is None]
+        if missing:
+            if missing != misses:  # evicted since the prefetch looked; redo those rows
+                pixel_values = self._trocr_pixel_values([chunk[j] for j in missing])
             if self.use_gpu:
-                pixel_values = pixel_values.to(self.device)
-            
-            # Generate text
-            generated_ids = self.trocr_model.generate(pixel_values)
-            generated_text = self.trocr_processor.batch_decode(generated_ids, skip_special_tokens=True)[0]
-            
-            # Create a single text region for the entire image
-            text_region = TextRegion(
-                bbox=[0, 0, image.shape[1], image.shape[0]],
-                text=generated_text,
-                confidence=0.7,  # Placeholder
-                language='en',  # TrOCR is primarily English
-                language_confidence=0.6
-            )
-            
-            return [text_region]
-            
-        except Exception as e:
-            logger.error(f"TrOCR extraction failed: {e}")
-            return []
+                pixel_values = pixel_values.to(self.device, dtype=self.trocr_model.dtype, non_blocking=True)
+            encoded = self.trocr_model.encoder(pixel_values=pixel_values).last_hidden_state
+            with self._trocr_cache_lock:
+                for j, state in zip(missing, encoded):
+                    # clone() so an entry does not pin the whole batch's storage
+                    rows[j] = self._trocr_encoder_cache[keys[j]] = state.clone()
+                while len(self._trocr_encoder_cache) > TROCR_ENCODER_CACHE_SIZE:
+                    self._trocr_encoder_cache.popitem(last=False)
+        
+        return torch.stack(rows)
+    
+    def _trocr_pixel_values(self, chunk: List[np.ndarray]) -> torch.Tensor:
+        """TrOCR processor output for a chunk of images, pinned when it will go to the GPU"""
+        # Convert numpy arrays (BGR or grayscale) to PIL Images; the processor resizes
+        # each to the encoder's fixed input size, so a batch needs no padding
+        pil_images = [
+            Image.fromarray(cv2.cvtColor(image, cv2.COLOR_BGR2RGB) if image.ndim == 3 else image)
+            for image in chunk
+        ]
+        pixel_values = self.trocr_processor(pil_images, return_tensors="pt").pixel_values
+        return pixel_values.pin_memory() if self.use_gpu else pixel_values
+    
+    @staticmethod
+    def _crop_key(image: np.ndarray) -> bytes:
+        """Content hash of a crop (pixels, shape and dtype)"""
+        digest = hashlib.blake2b(np.ascontiguousarray(image).data, digest_size=16)
+        digest.update(f"{image.shape}{image.dtype}".encode())
+        return digest.digest()
     
     def _detect_language_from_text(self, text: str) -> str:
         """Simple language detection based on character sets"""
-        # Count characters from different scripts
-        arabic_chars = len(re.findall(r'[\u0600-\u06FF\u0750-\u077F\u08A0-\u08FF\uFB50-\uFDFF\uFE70-\uFEFF]', text))
-        devanagari_chars = len(re.findall(r'[\u0900-\u097F]', text))
-        urdu_chars = len(re.findall(r'[\u0600-\u06FF]', text))  # Overlaps with Arabic
-        persian_chars = len(re.findall(r'[\u0600-\u06FF\uFB50-\uFDFF]', text))  # Overlaps with Arabic
+        # Count characters from different scripts in a single pass over the codepoints
+        cps = np.frombuffer(text.encode('utf-32-le'), dtype=np.uint32)
+        if _count_scripts is not None:
+            arabic_block, arabic_other, forms_a, devanagari_chars = _count_scripts(cps)
+        else:
+            counts = np.bincount(np.searchsorted(_SCRIPT_EDGES, cps, side='right'), minlength=_SCRIPT_EDGES.size + 1)
+            arabic_block, forms_a, devanagari_chars = (int(counts[_BIN_ARABIC]), int(counts[_BIN_PRES_FORMS_A]),
+                                                       int(counts[_BIN_DEVANAGARI]))
+            arabic_other = int(counts[[_BIN_ARABIC_SUP, _BIN_ARABIC_EXT_A, _BIN_PRES_FORMS_B]].sum())
+        arabic_chars = arabic_block + arabic_other + forms_a
+        urdu_chars = arabic_block  # Overlaps with Arabic
+        persian_chars = arabic_block + forms_a  # Overlaps with Arabic
         
         # Simple heuristics
         if arabic_chars > 0:
@@ -248,18 +809,21 @@ class MultilingualOCR:
                 region.text = cleaned_text
                 processed_regions.append(region)
         
-        # Sort by position (top to bottom, left to right)
-        processed_regions.sort(key=lambda x: (x.bbox[1], x.bbox[0]))
+        # Sort by position (top to bottom, left to right); lexsort is stable like list.sort
+        if len(processed_regions) > 1:
+            corners = np.array([region.bbox[:2] for region in processed_regions], dtype=np.float64)
+            order = np.lexsort((corners[:, 0], corners[:, 1]))
+            processed_regions = [processed_regions[i] for i in order.tolist()]
         
         return processed_regions
     
     def _clean_text(self, text: str) -> str:
         """Clean extracted text"""
         # Remove extra whitespace
-        text = re.sub(r'\s+', ' ', text)
+        text = _RE_WS.sub(' ', text)
         
         # Remove special characters that might be OCR artifacts
-        text = re.sub(r'[^\w\s\u0600-\u06FF\u0900-\u097F\u0750-\u077F\u08A0-\u08FF\uFB50-\uFDFF\uFE70-\uFEFF]', '', text)
+        text = _RE_ARTIFACTS.sub('', text)
         
         return text.strip()
     
@@ -267,6 +831,9 @@ class MultilingualOCR:
         """
         Calculate Character Error Rate (CER) and Word Error Rate (WER)
         
+        Both are Levenshtein edit distances normalized by the reference length
+        (characters for CER, whitespace-separated words for WER).
+        
         Args:
             predicted_text: Text extracted by OCR
             ground_truth_text: Reference text
@@ -274,45 +841,135 @@ class MultilingualOCR:
         Returns:
             Dictionary with CER and WER scores
         """
-        from difflib import SequenceMatcher
+        return self.batch_cer_wer([predicted_text], [ground_truth_text])[0]
+    
+    def batch_cer_wer(self, predicted_texts: List[str], ground_truth_texts: List[str]) -> List[Dict[str, float]]:
+        """CER/WER for paired predictions and references, computed across cores when possible"""
+        pred_words = [text.split() for text in predicted_texts]
+        gt_words = [text.split() for text in ground_truth_texts]
         
-        # Calculate CER
-        cer = 1 - SequenceMatcher(None, predicted_text, ground_truth_text).ratio()
+        char_distances = _pairwise_edit_distances(predicted_texts, ground_truth_texts)
+        word_distances = _pairwise_edit_distances(pred_words, gt_words)
         
-        # Calculate WER
-        pred_words = predicted_text.split()
-        gt_words = ground_truth_text.split()
+        results = []
+        for pred, gt, pw, gw, char_dist, word_dist in zip(predicted_texts, ground_truth_texts, pred_words,
+                                                           gt_words, char_distances, word_distances):
+            # An empty reference scores 0 for an empty prediction and 1 otherwise
+            cer = char_dist / len(gt) if gt else (1.0 if pred else 0.0)
+            wer = word_dist / len(gw) if gw else (1.0 if pw else 0.0)
+            results.append({
+                'cer': cer,
+                'wer': wer,
+                'cer_percentage': cer * 100,
+                'wer_percentage': wer * 100
+            })
+        return results
+    
+    def batch_extract(self, images: List[np.ndarray], bboxes: Optional[List[List[float]]] = None,
+                      batch_size: int = 16, n_width: Optional[int] = None,
+                      n_height: Optional[int] = None, legacy: bool = True) -> Union[List[OCRResult], OCRBatch]:
+        """
+        Extract text from multiple images with batched EasyOCR recognition
         
-        if len(gt_words) == 0:
-            wer = 1.0 if len(pred_words) > 0 else 0.0
-        else:
-            wer = 1 - SequenceMatcher(None, pred_words, gt_words).ratio()
+        Images are preprocessed in a thread pool and recognized with readtext_batched
+        while the pool keeps preprocessing, so CPU and GPU work overlap.
+        By default only same-sized inputs (e.g. pages rendered at one DPI) share a batch,
+        so nothing is resized. Passing n_width and n_height resizes every input to that
+        size so all of them batch together; boxes are mapped back to input coordinates.
+        Without EasyOCR, TrOCR runs over batch_size images per generate() call instead.
+        Inputs that fail in a batch are retried one at a time through extract_text.
+        With legacy=False the pages come back as a single OCRBatch of flat arrays.
+        """
+        if not images:
+            return [] if legacy else OCRBatch.from_results([])
         
-        return {
-            'cer': cer,
-            'wer': wer,
-            'cer_percentage': cer * 100,
-            'wer_percentage': wer * 100
-        }
-    
-    def batch_extract(self, images: List[np.ndarray], bboxes: Optional[List[List[float]]] = None) -> List[OCRResult]:
-        """Extract text from multiple images"""
-        results = []
+        start_time = time.time()
+        crops = [self._crop(image, bboxes[i] if bboxes else None) for i, image in enumerate(images)]
         
-        for i, image in enumerate(images):
-            bbox = bboxes[i] if bboxes else None
+        # cv2 releases the GIL, so preprocessing scales across threads; map() yields in
+        # input order as soon as each image is ready
+        raw_regions = [None] * len(images)
+        with ThreadPoolExecutor(max_workers=min(len(crops), os.cpu_count() or 1)) as pool:
+            processed = pool.map(self._safe_preprocess, crops)
+            if self.reader:
+                self._easyocr_batched(processed, raw_regions, batch_size, n_width, n_height)
+            else:
+                processed = list(processed)
+                valid = [i for i, image in enumerate(processed) if image is not None]
+                trocr_regions = self._extract_with_trocr_batched([processed[i] for i in valid], batch_size)
+                for i, regions in zip(valid, trocr_regions):
+                    raw_regions[i] = regions
+        
+        # Batched work is shared, so each result reports an equal share of its wall time
+        time_per_image = (time.time() - start_time) / len(images)
+        
+        results = []
+        for i, regions in enumerate(raw_regions):
+            if regions is None:
+                results.append(self._extract_or_empty(i, images[i], bboxes))
+                continue
             try:
-                result = self.extract_text(image, bbox)
-                results.append(result)
+                text_regions = self._post_process_text_regions(regions)
+                results.append(self._build_result(text_regions, time_per_image))
             except Exception as e:
                 logger.error(f"Failed to extract text from image {i}: {e}")
-                # Create empty result
-                empty_result = OCRResult(
-                    text_regions=[],
-                    overall_text="",
-                    detected_languages=[],
-                    processing_time=0.0
-                )
-                results.append(empty_result)
+                results.append(self._build_result([], 0.0))
         
-        return results
+        return results if legacy else OCRBatch.from_results(results)
+    
+    def _easyocr_batched(self, processed: Iterable[Optional[np.ndarray]], raw_regions: List,
+                         batch_size: int, n_width: Optional[int], n_height: Optional[int]):
+        """
+        readtext_batched over preprocessed images as they arrive, filling raw_regions[i]
+        
+        Images are grouped by shape (all together when resizing) and a group is recognized
+        as soon as it holds batch_size images; leftovers run at the end. Failed
+        preprocessing (None) and failed batches leave raw_regions[i] as None.
+        """
+        resize = n_width is not None and n_height is not None
+        pending = defaultdict(list)
+        for i, image in enumerate(processed):
+            if image is None:
+                continue
+            key = None if resize else image.shape[:2]
+            pending[key].append((i, image))
+            if len(pending[key]) == batch_size:
+                self._readtext_group(pending.pop(key), raw_regions, batch_size, n_width, n_height)
+        
+        for group in pending.values():
+            self._readtext_group(group, raw_regions, batch_size, n_width, n_height)
+    
+    def _readtext_group(self, group: List[Tuple[int, np.ndarray]], raw_regions: List,
+                        batch_size: int, n_width: Optional[int], n_height: Optional[int]):
+        """One readtext_batched call over (index, image) pairs of a single shape group"""
+        resize = n_width is not None and n_height is not None
+        try:
+            batch_results = self.reader.readtext_batched(
+                [image for _, image in group],
+                n_width=n_width, n_height=n_height, batch_size=batch_size
+            )
+            for (i, image), result in zip(group, batch_results):
+                h, w = image.shape[:2]
+                scale = (w / n_width, h / n_height) if resize else (1.0, 1.0)
+                raw_regions[i] = self._process_easyocr_results(result, scale)
+        except Exception as e:
+            logger.warning(f"Batched EasyOCR failed for {len(group)} images: {e}")
+    
+    def _safe_preprocess(self, image: np.ndarray) -> Optional[np.ndarray]:
+        """_preprocess_image that returns None on failure (handled per image later)"""
+        try:
+            return self._preprocess_image(image)
+        except Exception as e:
+            logger.debug(f"Preprocessing failed: {e}")
+            return None
+    
+    def _extract_or_empty(self, i: int, image: np.ndarray,
+                          bboxes: Optional[List[List[float]]]) -> OCRResult:
+        """Unbatched extract_text for one input, with an empty result on failure"""
+        bbox = bboxes[i] if bboxes else None
+        try:
+            return self.extract_text(image, bbox)
+        except Exception as e:
+            logger.error(f"Failed to extract text from image {i}: {e}")
+            # Create empty result
+            return self._build_result([], 0.0)
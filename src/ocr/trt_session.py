@@ -0,0 +1,174 @@
+"""
+TensorRT inference session for OCR models
+Builds FP16 engines from ONNX exports once per GPU architecture and runs them
+with preallocated device buffers; used as an optional EasyOCR recognizer backend
+"""
+
+import os
+import logging
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import torch
+
+try:
+    import tensorrt as trt
+except ImportError:
+    trt = None
+
+logger = logging.getLogger(__name__)
+
+# EasyOCR recognizer input: (N, 1, 64, W) grayscale line crops
+RECOGNIZER_HEIGHT = 64
+
+def export_recognizer_onnx(recognizer: torch.nn.Module, onnx_path: str, width: int = 256) -> str:
+    """Export an EasyOCR recognizer to ONNX with dynamic batch and width axes"""
+    class _ImageOnly(torch.nn.Module):
+        # EasyOCR's CTC recognizers ignore their `text` argument
+        def __init__(self, model):
+            super().__init__()
+            self.model = model
+
+        def forward(self, image):
+            return self.model(image, None)
+
+    recognizer = getattr(recognizer, 'module', recognizer)  # unwrap DataParallel
+    device = next(recognizer.parameters()).device
+    dummy = torch.zeros(1, 1, RECOGNIZER_HEIGHT, width, device=device)
+    torch.onnx.export(
+        _ImageOnly(recognizer).eval(), (dummy,), onnx_path,
+        input_names=['input'], output_names=['output'],
+        dynamic_axes={'input': {0: 'batch', 3: 'width'}, 'output': {0: 'batch', 1: 'steps'}},
+        opset_version=17
+    )
+    return onnx_path
+
+class TRTInferSession:
+    """
+    Single-input, single-output TensorRT engine
+
+    The engine is built from `onnx_path` on first use and serialized next to the
+    other OCR models as `<name>_sm<cc>_fp16.engine`, so later runs on the same GPU
+    architecture only deserialize it. Host inputs are staged through a pinned buffer
+    and copied asynchronously on the session's own stream.
+    """
+
+    def __init__(self, onnx_path: str, cache_dir: str = './models/ocr_models', fp16: bool = True,
+                 shape_profile: Optional[Tuple[Tuple[int, ...], Tuple[int, ...], Tuple[int, ...]]] = None):
+        if trt is None:
+            raise ImportError("tensorrt is not installed")
+        if not torch.cuda.is_available():
+            raise RuntimeError("TensorRT sessions need a CUDA device")
+
+        self._logger = trt.Logger(trt.Logger.WARNING)
+        self._engine = self._load_or_build(onnx_path, cache_dir, fp16, shape_profile)
+        self._context = self._engine.create_execution_context()
+        self._stream = torch.cuda.Stream()
+
+        names = [self._engine.get_tensor_name(i) for i in range(self._engine.num_io_tensors)]
+        inputs = [n for n in names if self._engine.get_tensor_mode(n) == trt.TensorIOMode.INPUT]
+        outputs = [n for n in names if self._engine.get_tensor_mode(n) == trt.TensorIOMode.OUTPUT]
+        if len(inputs) != 1 or len(outputs) != 1:
+            raise ValueError(f"Expected one input and one output, got {inputs} -> {outputs}")
+        self.input_name, self.output_name = inputs[0], outputs[0]
+
+        # Device/pinned buffers grow to the largest shape seen and are reused after that
+        self._buffers: Dict[str, torch.Tensor] = {}
+        self._pinned: Optional[torch.Tensor] = None
+
+    def _load_or_build(self, onnx_path, cache_dir, fp16, shape_profile):
+        """Deserialize the cached engine for this GPU architecture, building it if missing"""
+        major, minor = torch.cuda.get_device_capability()
+        name = os.path.splitext(os.path.basename(onnx_path))[0]
+        engine_path = os.path.join(cache_dir, f"{name}_sm{major}{minor}_{'fp16' if fp16 else 'fp32'}.engine")
+        runtime = trt.Runtime(self._logger)
+
+        if os.path.exists(engine_path):
+            with open(engine_path, 'rb') as f:
+                engine = runtime.deserialize_cuda_engine(f.read())
+            if engine is not None:
+                logger.info(f"Loaded TensorRT engine {engine_path}")
+                return engine
+            logger.warning(f"Cached engine {engine_path} is unusable, rebuilding")
+
+        builder = trt.Builder(self._logger)
+        network = builder.create_network(1 << int(trt.NetworkDefinitionCreationFlag.EXPLICIT_BATCH))
+        parser = trt.OnnxParser(network, self._logger)
+        with open(onnx_path, 'rb') as f:
+            if not parser.parse(f.read()):
+                errors = [str(parser.get_error(i)) for i in range(parser.num_errors)]
+                raise RuntimeError(f"Failed to parse {onnx_path}: {errors}")
+
+        config = builder.create_builder_config()
+        if fp16 and builder.platform_has_fast_fp16:
+            config.set_flag(trt.BuilderFlag.FP16)
+        if shape_profile is not None:
+            profile = builder.create_optimization_profile()
+            profile.set_shape(network.get_input(0).name, *shape_profile)
+            config.add_optimization_profile(profile)
+
+        serialized = builder.build_serialized_network(network, config)
+        if serialized is None:
+            raise RuntimeError(f"TensorRT engine build failed for {onnx_path}")
+        os.makedirs(cache_dir, exist_ok=True)
+        with open(engine_path, 'wb') as f:
+            f.write(serialized)
+        logger.info(f"Built TensorRT engine {engine_path}")
+        return runtime.deserialize_cuda_engine(serialized)
+
+    def _buffer(self, name: str, shape: Tuple[int, ...], dtype: torch.dtype) -> torch.Tensor:
+        """Reusable device buffer of at least the requested size"""
+        numel = int(np.prod(shape))
+        buf = self._buffers.get(name)
+        if buf is None or buf.numel() < numel or buf.dtype != dtype:
+            buf = torch.empty(numel, dtype=dtype, device='cuda')
+            self._buffers[name] = buf
+        return buf[:numel].view(shape)
+
+    def infer_tensor(self, x: torch.Tensor) -> torch.Tensor:
+        """Run the engine on a CUDA tensor; the result is a CUDA tensor"""
+        x = x.contiguous()
+        self._context.set_input_shape(self.input_name, tuple(x.shape))
+        out_shape = tuple(self._context.get_tensor_shape(self.output_name))
+        out_dtype = torch.from_numpy(np.empty(0, dtype=trt.nptype(self._engine.get_tensor_dtype(self.output_name)))).dtype
+        out = self._buffer(self.output_name, out_shape, out_dtype)
+
+        self._stream.wait_stream(torch.cuda.current_stream())
+        self._context.set_tensor_address(self.input_name, x.data_ptr())
+        self._context.set_tensor_address(self.output_name, out.data_ptr())
+        self._context.execute_async_v3(self._stream.cuda_stream)
+        torch.cuda.current_stream().wait_stream(self._stream)
+        return out
+
+    def infer(self, array: np.ndarray) -> np.ndarray:
+        """Run the engine on a host array, staging it through pinned memory"""
+        array = np.ascontiguousarray(array, dtype=np.float32)
+        if self._pinned is None or self._pinned.numel() < array.size:
+            self._pinned = torch.empty(array.size, dtype=torch.float32, pin_memory=True)
+        staged = self._pinned[:array.size].view(array.shape)
+        staged.numpy()[...] = array
+        with torch.cuda.stream(self._stream):
+            x = self._buffer(self.input_name, array.shape, torch.float32)
+            x.copy_(staged, non_blocking=True)
+        torch.cuda.current_stream().wait_stream(self._stream)
+        return self.infer_tensor(x).cpu().numpy()
+
+class TRTRecognizer(torch.nn.Module):
+    """
+    Drop-in replacement for `easyocr.Reader.recognizer` backed by a TRTInferSession
+
+    Falls back to the original PyTorch recognizer if the engine rejects a batch
+    (e.g. a line wider than the engine's shape profile).
+    """
+
+    def __init__(self, session: TRTInferSession, fallback: torch.nn.Module):
+        super().__init__()
+        self.session = session
+        self.fallback = fallback
+
+    def forward(self, image, text=None):
+        try:
+            return self.session.infer_tensor(image.float()).clone()
+        except Exception as e:
+            logger.debug(f"TensorRT recognizer failed, using PyTorch: {e}")
+            return self.fallback(image, text)
@@ -10,7 +10,7 @@ import cv2
 import json
 import logging
 import time
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Union
 from pathlib import Path
 import numpy as np
 
@@ -51,11 +51,11 @@ class PS05Pipeline:
         
         logger.info("PS-05 Pipeline initialized successfully")
     
-    def process_image(self, image_path: str, stage: int = 1) -> Dict:
+    def process_image(self, image_path: Union[str, Path, np.ndarray], stage: int = 1) -> Dict:
         """Process a single document image.
         
         Args:
-            image_path: Path to the input image
+            image_path: Path to the input image, or an already decoded BGR image array
             stage: Processing stage (1: Layout, 2: +OCR, 3: +NL)
             
         Returns:
@@ -105,8 +105,10 @@ class PS05Pipeline:
                 "processing_time": time.time() - start_time
             }
     
-    def _load_image(self, image_path: str):
-        """Load image from path."""
+    def _load_image(self, image_path: Union[str, Path, np.ndarray]):
+        """Load image from path, passing in-memory arrays through without decoding."""
+        if isinstance(image_path, np.ndarray):
+            return image_path
         try:
             image = cv2.imread(str(image_path))
             if image is None:
@@ -275,11 +277,11 @@ class PS05Pipeline:
             logger.error(f"Error classifying figure type: {e}")
             return "image"
 
-def infer_page(image_path: str, config_path: str = "configs/ps05_config.yaml", stage: int = 1) -> Dict:
+def infer_page(image_path: Union[str, Path, np.ndarray], config_path: str = "configs/ps05_config.yaml", stage: int = 1) -> Dict:
     """Convenience function for single page inference.
     
     Args:
-        image_path: Path to the input image
+        image_path: Path to the input image, or an already decoded BGR image array
         config_path: Path to configuration file
         stage: Processing stage (1: Layout, 2: +OCR, 3: +NL)
         
@@ -7,14 +7,14 @@ import cv2
 import numpy as np
 from typing import Dict, List, Tuple, Optional, Union
 import logging
-import json
+import orjson
 import time
 from dataclasses import dataclass, asdict
 from pathlib import Path
 
 # Import our modules
 from ..ocr.multilingual_ocr import MultilingualOCR, OCRResult, TextRegion
-from ..ocr.language_detector import LanguageDetector, LanguageDetectionResult
+from ..ocr.language_detector import LanguageDetectionResult, get_default_detector
 from ..nlg.visual_to_text import VisualToTextGenerator, NLGResult
 from ..models.layout_detector import LayoutDetector
 from ..data.deskew import ImageDeskewer
@@ -78,7 +78,7 @@ class Stage2Pipeline:
             )
             
             # Language detector
-            self.language_detector = LanguageDetector()
+            self.language_detector = get_default_detector()
             
             # Visual to text generator
             self.visual_generator = VisualToTextGenerator(
@@ -393,16 +393,12 @@ class Stage2Pipeline:
     def _evaluate_text_extraction(self, predictions: List[Dict], ground_truth: List[Dict]) -> Dict:
         """Evaluate text extraction using CER/WER"""
         try:
-            total_cer = 0.0
-            total_wer = 0.0
-            valid_pairs = 0
-            
-            for pred, gt in zip(predictions, ground_truth):
-                if pred['text'] and gt['text']:
-                    metrics = self.ocr.calculate_cer_wer(pred['text'], gt['text'])
-                    total_cer += metrics['cer']
-                    total_wer += metrics['wer']
-                    valid_pairs += 1
+            pairs = [(pred['text'], gt['text']) for pred, gt in zip(predictions, ground_truth)
+                     if pred['text'] and gt['text']]
+            all_metrics = self.ocr.batch_cer_wer([p for p, _ in pairs], [g for _, g in pairs])
+            total_cer = sum(metrics['cer'] for metrics in all_metrics)
+            total_wer = sum(metrics['wer'] for metrics in all_metrics)
+            valid_pairs = len(pairs)
             
             if valid_pairs > 0:
                 avg_cer = total_cer / valid_pairs
@@ -489,9 +485,10 @@ class Stage2Pipeline:
             # Convert dataclass to dict
             results_dict = asdict(results)
             
-            # Save to file
-            with open(output_path, 'w', encoding='utf-8') as f:
-                json.dump(results_dict, f, indent=2, ensure_ascii=False)
+            # Save to file (orjson writes UTF-8 directly; NumPy scalars/arrays serialize natively)
+            Path(output_path).write_bytes(
+                orjson.dumps(results_dict, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY)
+            )
             
             logger.info(f"Results saved to: {output_path}")
             
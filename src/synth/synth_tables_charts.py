@@ -1,19 +1,19 @@
 """Synthetic table and chart image generator (simple) for weak supervision."""
 from PIL import Image, ImageDraw, ImageFont
-import random, os, json, textwrap
+import numpy as np
+import os, json, textwrap
 
 def gen_simple_table(cols=3, rows=4, cell_w=200, cell_h=60):
     w = cols * cell_w + 20
     h = rows * cell_h + 20
-    img = Image.new('RGB', (w,h), (255,255,255))
+    # draw grid: 1px black rules written straight into the pixel array
+    arr = np.full((h, w, 3), 255, dtype=np.uint8)
+    ys = 10 + np.arange(rows+1)*cell_h
+    xs = 10 + np.arange(cols+1)*cell_w
+    arr[ys, 10:11+cols*cell_w] = 0
+    arr[10:11+rows*cell_h, xs] = 0
+    img = Image.fromarray(arr)
     d = ImageDraw.Draw(img)
-    # draw grid
-    for i in range(rows+1):
-        y = 10 + i*cell_h
-        d.line([(10,y),(10+cols*cell_w,y)], fill=(0,0,0))
-    for j in range(cols+1):
-        x = 10 + j*cell_w
-        d.line([(x,10),(x,10+rows*cell_h)], fill=(0,0,0))
     # fill sample text
     font = ImageFont.load_default()
     for r in range(rows):
@@ -26,20 +26,23 @@ def gen_simple_table(cols=3, rows=4, cell_w=200, cell_h=60):
     return img, meta
 
 def gen_simple_bar_chart(series=2, bars=5, w=600, h=400):
-    img = Image.new('RGB', (w,h), (255,255,255))
-    d = ImageDraw.Draw(img)
     margin = 50
     max_h = h - 2*margin
     spacing = (w - 2*margin) / bars
-    for i in range(bars):
-        for s in range(series):
-            val = random.randint(10,90)
-            bar_w = spacing * 0.6 / series
-            x0 = margin + i*spacing + s*bar_w
-            x1 = x0 + bar_w
-            y1 = h - margin
-            y0 = y1 - (val/100.0)*max_h
-            d.rectangle([x0,y0,x1,y1], outline='black', fill='gray')
+    bar_w = spacing * 0.6 / series
+    # Heights come from NumPy's global RNG: seed with np.random.seed(), random.seed() has no effect
+    vals = np.random.randint(10, 91, size=(bars, series))
+    # bar corners for every (bar, series) at once; truncated to ints the way ImageDraw does
+    left = margin + np.arange(bars)[:, None]*spacing + np.arange(series)[None, :]*bar_w
+    x0 = left.astype(int)
+    x1 = (left + bar_w).astype(int)
+    y1 = h - margin
+    y0 = (y1 - (vals/100.0)*max_h).astype(int)
+    arr = np.full((h, w, 3), 255, dtype=np.uint8)
+    for bx0, by0, bx1 in zip(x0.ravel().tolist(), y0.ravel().tolist(), x1.ravel().tolist()):
+        arr[by0:y1+1, bx0:bx1+1] = 0        # black outline (inclusive corners)
+        arr[by0+1:y1, bx0+1:bx1] = 128      # gray fill inside it
+    img = Image.fromarray(arr)
     meta = {'type':'bar','series':series,'bars':bars}
     return img, meta
 
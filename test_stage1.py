@@ -8,6 +8,7 @@ Tests the basic functionality of Stage 1 layout detection.
 import cv2
 import numpy as np
 import json
+import functools
 from pathlib import Path
 import logging
 
@@ -15,10 +16,17 @@ import logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+TEST_DOCUMENT_PATH = "test_document.png"
+
 def create_test_document():
-    """Create a test document image for testing."""
+    """Create a test document image for testing (a fresh copy of the cached render)."""
+    return _render_test_document().copy()
+
+@functools.lru_cache(maxsize=1)
+def _render_test_document():
+    """Render the test document once per process; callers get copies."""
     # Create a white background
-    img = np.ones((800, 600, 3), dtype=np.uint8) * 255
+    img = np.full((800, 600, 3), 255, dtype=np.uint8)
     
     # Add title
     cv2.putText(img, "Test Document", (50, 100), 
@@ -40,8 +48,15 @@ def create_test_document():
     cv2.putText(img, "Figure", (470, 560), 
                cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 0, 0), 1)
     
+    img.setflags(write=False)
     return img
 
+@functools.lru_cache(maxsize=1)
+def save_test_document():
+    """Write the test document to TEST_DOCUMENT_PATH once per process."""
+    cv2.imwrite(TEST_DOCUMENT_PATH, _render_test_document())
+    return TEST_DOCUMENT_PATH
+
 def test_layout_detector():
     """Test the layout detector."""
     try:
@@ -60,15 +75,15 @@ def test_layout_detector():
         
         logger.info(f"Layout detection completed. Found {len(results)} elements:")
         
-        for i, result in enumerate(results):
-            bbox = result['bbox']
-            cls = result['cls']
-            score = result['score']
-            logger.info(f"  {i+1}. {cls}: bbox={bbox}, score={score:.3f}")
+        if logger.isEnabledFor(logging.INFO):
+            for i, result in enumerate(results):
+                bbox = result['bbox']
+                cls = result['cls']
+                score = result['score']
+                logger.info(f"  {i+1}. {cls}: bbox={bbox}, score={score:.3f}")
         
         # Save test image
-        test_img_path = "test_document.png"
-        cv2.imwrite(test_img_path, test_img)
+        test_img_path = save_test_document()
         logger.info(f"Test image saved to {test_img_path}")
         
         return results
@@ -85,9 +100,7 @@ def test_pipeline_stage1():
         logger.info("Testing Stage 1 Pipeline...")
         
         # Create test image
-        test_img = create_test_document()
-        test_img_path = "test_document.png"
-        cv2.imwrite(test_img_path, test_img)
+        test_img_path = save_test_document()
         
         # Initialize pipeline
         pipeline = PS05Pipeline()
@@ -143,7 +156,7 @@ def test_dataset_preparation():
             
             # Check output structure
             output_path = Path(output_dir)
-            if output_path.exists():
+            if output_path.exists() and logger.isEnabledFor(logging.INFO):
                 logger.info("Dataset output structure:")
                 for split in ['train', 'val', 'test']:
                     split_path = output_path / split
@@ -7,6 +7,8 @@ import cv2
 import numpy as np
 import json
 import logging
+import functools
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 import sys
 import os
@@ -18,61 +20,130 @@ sys.path.append(str(Path(__file__).parent / 'src'))
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-def create_test_document():
-    """Create a test document with multiple languages and visual elements"""
+# Black FONT_HERSHEY_SIMPLEX masks keyed by (text, scale, thickness), each
+# stored with the mask-local origin the string was drawn at
+_GLYPH_CACHE = {}
+
+def blit_text(img, text, org, scale, thick):
+    """Draw black text on a white background exactly as cv2.putText would, rasterizing each unique string once"""
+    key = (text, scale, thick)
+    cached = _GLYPH_CACHE.get(key)
+    if cached is None:
+        (w, h), baseline = cv2.getTextSize(text, cv2.FONT_HERSHEY_SIMPLEX, scale, thick)
+        pad = 2 * thick
+        mask = np.full((h + baseline + 2 * pad, w + 2 * pad), 255, dtype=np.uint8)
+        cv2.putText(mask, text, (pad, h + pad), cv2.FONT_HERSHEY_SIMPLEX, scale, 0, thick)
+        cached = _GLYPH_CACHE[key] = (mask, pad, h + pad)
+    mask, ox, oy = cached
+
+    # Composite the mask at org, clipped to the image bounds
+    top, left = org[1] - oy, org[0] - ox
+    y0, x0 = max(top, 0), max(left, 0)
+    y1 = min(top + mask.shape[0], img.shape[0])
+    x1 = min(left + mask.shape[1], img.shape[1])
+    if y0 < y1 and x0 < x1:
+        region = img[y0:y1, x0:x1]
+        np.minimum(region, mask[y0 - top:y1 - top, x0 - left:x1 - left, None], out=region)
+    return img
+
+def _build_test_document():
+    """Render a test document with multiple languages and visual elements"""
     # Create a test image with text and visual elements
-    img = np.ones((800, 1200, 3), dtype=np.uint8) * 255
+    img = np.full((800, 1200, 3), 255, dtype=np.uint8)
     
     # Add some text regions (simulating different languages)
-    cv2.putText(img, "Document Title", (50, 50), cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 0, 0), 2)
-    cv2.putText(img, "This is English text", (50, 100), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 0, 0), 2)
-    cv2.putText(img, "यह हिंदी टेक्स्ट है", (50, 150), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 0, 0), 2)
-    cv2.putText(img, "هذا نص عربي", (50, 200), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 0, 0), 2)
+    blit_text(img, "Document Title", (50, 50), 1, 2)
+    blit_text(img, "This is English text", (50, 100), 0.7, 2)
+    blit_text(img, "यह हिंदी टेक्स्ट है", (50, 150), 0.7, 2)
+    blit_text(img, "هذا نص عربي", (50, 200), 0.7, 2)
     
     # Add a table region
     cv2.rectangle(img, (50, 250), (400, 400), (0, 0, 0), 2)
-    cv2.putText(img, "Table Data", (60, 280), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 0, 0), 2)
+    blit_text(img, "Table Data", (60, 280), 0.6, 2)
     
     # Add a chart region
     cv2.rectangle(img, (450, 250), (800, 400), (0, 0, 0), 2)
-    cv2.putText(img, "Chart Data", (460, 280), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 0, 0), 2)
+    blit_text(img, "Chart Data", (460, 280), 0.6, 2)
     
     # Add a map region
     cv2.rectangle(img, (850, 250), (1150, 400), (0, 0, 0), 2)
-    cv2.putText(img, "Map Data", (860, 280), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 0, 0), 2)
+    blit_text(img, "Map Data", (860, 280), 0.6, 2)
     
     # Add more text in different languages
-    cv2.putText(img, "More English content", (50, 450), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 0, 0), 2)
-    cv2.putText(img, "अधिक हिंदी सामग्री", (50, 500), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 0, 0), 2)
-    cv2.putText(img, "محتوى عربي إضافي", (50, 550), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 0, 0), 2)
+    blit_text(img, "More English content", (50, 450), 0.6, 2)
+    blit_text(img, "अधिक हिंदी सामग्री", (50, 500), 0.6, 2)
+    blit_text(img, "محتوى عربي إضافي", (50, 550), 0.6, 2)
     
-    # Save test document
-    test_path = "test_stage2_document.png"
-    cv2.imwrite(test_path, img)
-    logger.info(f"Test document created: {test_path}")
+    return img
+
+# Rendered and PNG-encoded once at import; tests only (re)write the cached bytes
+_TEST_IMG = _build_test_document()
+_TEST_PNG_BYTES = cv2.imencode('.png', _TEST_IMG, [cv2.IMWRITE_PNG_COMPRESSION, 1])[1].tobytes()
+
+def _build_element_images():
+    """Render one framed, labelled 200x300 canvas per visual element type"""
+    # Every canvas shares the frame; only the label differs
+    images = np.full((len(_ELEMENT_TYPES), 200, 300, 3), 255, dtype=np.uint8)
+    cv2.rectangle(images[0], (20, 20), (280, 180), (0, 0, 0), 2)
+    images[1:] = images[0]
+    for image, element_type in zip(images, _ELEMENT_TYPES):
+        blit_text(image, element_type.capitalize(), (120, 100), 1, 2)
+    return images
+
+_ELEMENT_TYPES = ('table', 'chart', 'map')
+_ELEMENT_IMAGES = _build_element_images()  # (3, 200, 300, 3)
+
+def create_test_document():
+    """Write the test document to disk (skipped when the file already holds the same bytes)"""
+    test_path = Path("test_stage2_document.png")
+    if not test_path.exists() or test_path.read_bytes() != _TEST_PNG_BYTES:
+        test_path.write_bytes(_TEST_PNG_BYTES)
+        logger.info(f"Test document created: {test_path}")
     
-    return test_path
+    return str(test_path)
+
+# Model-backed components are built once and shared by the tests below (a failed
+# construction is not cached, so each test still reports its own error)
+
+@functools.lru_cache(maxsize=1)
+def get_multilingual_ocr():
+    from ocr.multilingual_ocr import MultilingualOCR
+    return MultilingualOCR(use_gpu=False)  # Use CPU for testing
+
+@functools.lru_cache(maxsize=1)
+def get_visual_to_text_generator():
+    from nlg.visual_to_text import VisualToTextGenerator
+    return VisualToTextGenerator(use_gpu=False)  # Use CPU for testing
+
+@functools.lru_cache(maxsize=1)
+def get_stage2_pipeline():
+    from pipeline.stage2_pipeline import Stage2Pipeline
+    return Stage2Pipeline(config={'use_gpu': False})
+
+@functools.lru_cache(maxsize=1)
+def get_stage3_pipeline():
+    from pipeline.stage3_pipeline import Stage3Pipeline
+    return Stage3Pipeline(config={'use_gpu': False})
 
 def test_multilingual_ocr():
     """Test multilingual OCR functionality"""
     logger.info("Testing Multilingual OCR...")
     
     try:
-        from ocr.multilingual_ocr import MultilingualOCR
-        
         # Initialize OCR
-        ocr = MultilingualOCR(use_gpu=False)  # Use CPU for testing
+        ocr = get_multilingual_ocr()
         
         # Create test image
         test_img = np.ones((200, 400, 3), dtype=np.uint8) * 255
-        cv2.putText(test_img, "Test Text", (50, 100), cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 0, 0), 2)
+        blit_text(test_img, "Test Text", (50, 100), 1, 2)
         
         # Test text extraction
         result = ocr.extract_text(test_img)
         
-        logger.info(f"OCR Result: {len(result.text_regions)} text regions detected")
-        logger.info(f"Overall text: {result.overall_text[:100]}...")
-        logger.info(f"Detected languages: {result.detected_languages}")
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(f"OCR Result: {len(result.text_regions)} text regions detected")
+            logger.info(f"Overall text: {result.overall_text[:100]}...")
+            logger.info(f"Detected languages: {result.detected_languages}")
         
         # Test CER/WER calculation
         test_gt = "Test Text"
@@ -104,15 +175,12 @@ def test_language_detection():
             "This is mixed English and हिंदी text"
         ]
         
-        results = []
-        for text in test_texts:
-            result = detector.detect_language(text, method='ensemble')
-            results.append(result)
-            logger.info(f"Text: {text[:30]}... -> Language: {result.detected_language} (confidence: {result.confidence:.2f})")
-        
-        # Test batch detection
-        batch_results = detector.batch_detect(test_texts)
-        logger.info(f"Batch detection: {len(batch_results)} results")
+        # Test batch detection (one call covers every text)
+        results = detector.batch_detect(test_texts, method='ensemble')
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(f"Batch detection: {len(results)} results")
+            for text, result in zip(test_texts, results):
+                logger.info(f"Text: {text[:30]}... -> Language: {result.detected_language} (confidence: {result.confidence:.2f})")
         
         # Test metrics calculation (with dummy ground truth)
         gt_languages = ['en', 'hi', 'ar', 'en']
@@ -133,52 +201,29 @@ def test_visual_to_text():
     logger.info("Testing Visual to Text Generation...")
     
     try:
-        from nlg.visual_to_text import VisualToTextGenerator
-        
         # Initialize generator
-        generator = VisualToTextGenerator(use_gpu=False)  # Use CPU for testing
-        
-        # Create test images for different element types
-        test_images = []
-        element_types = []
-        
-        # Table image
-        table_img = np.ones((200, 300, 3), dtype=np.uint8) * 255
-        cv2.rectangle(table_img, (20, 20), (280, 180), (0, 0, 0), 2)
-        cv2.putText(table_img, "Table", (120, 100), cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 0, 0), 2)
-        test_images.append(table_img)
-        element_types.append('table')
-        
-        # Chart image
-        chart_img = np.ones((200, 300, 3), dtype=np.uint8) * 255
-        cv2.rectangle(chart_img, (20, 20), (280, 180), (0, 0, 0), 2)
-        cv2.putText(chart_img, "Chart", (120, 100), cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 0, 0), 2)
-        test_images.append(chart_img)
-        element_types.append('chart')
-        
-        # Map image
-        map_img = np.ones((200, 300, 3), dtype=np.uint8) * 255
-        cv2.rectangle(map_img, (20, 20), (280, 180), (0, 0, 0), 2)
-        cv2.putText(map_img, "Map", (120, 100), cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 0, 0), 2)
-        test_images.append(map_img)
-        element_types.append('map')
-        
-        # Test generation
-        bboxes = [[0, 0, 300, 200]] * 3  # Same bbox for all
-        
-        for i, (img, elem_type, bbox) in enumerate(zip(test_images, element_types, bboxes)):
-            result = generator.generate_description(img, bbox, elem_type)
-            logger.info(f"{elem_type.capitalize()} description: {result.generated_text[:100]}...")
-        
-        # Test batch generation
+        generator = get_visual_to_text_generator()
+        
+        # Test images for different element types (rendered once at import)
+        test_images = list(_ELEMENT_IMAGES)
+        element_types = list(_ELEMENT_TYPES)
+        
+        # Test generation: one batched call for all element types
+        bboxes = [[0, 0, 300, 200]] * len(test_images)  # Same bbox for all
         batch_results = generator.batch_generate(test_images, bboxes, element_types)
         logger.info(f"Batch generation: {len(batch_results)} results")
         
-        # Test evaluation
+        # Test evaluation: one batched BERTScore pass over all descriptions
         test_gt = "This is a test description"
-        for result in batch_results:
-            metrics = generator.evaluate_generation(result.generated_text, test_gt, result.element_type)
-            logger.info(f"{result.element_type} evaluation - Combined score: {metrics.combined_score:.3f}")
+        metrics_list = generator.batch_evaluate(
+            [result.generated_text for result in batch_results],
+            [test_gt] * len(batch_results),
+            [result.element_type for result in batch_results]
+        )
+        if logger.isEnabledFor(logging.INFO):
+            for result, metrics in zip(batch_results, metrics_list):
+                logger.info(f"{result.element_type.capitalize()} description: {result.generated_text[:100]}...")
+                logger.info(f"{result.element_type} evaluation - Combined score: {metrics.combined_score:.3f}")
         
         logger.info("✅ Visual to Text Generation test passed")
         return True
@@ -192,10 +237,8 @@ def test_stage2_pipeline():
     logger.info("Testing Stage 2 Pipeline...")
     
     try:
-        from pipeline.stage2_pipeline import Stage2Pipeline
-        
         # Initialize pipeline
-        pipeline = Stage2Pipeline(config={'use_gpu': False})
+        pipeline = get_stage2_pipeline()
         
         # Create test document
         test_doc_path = create_test_document()
@@ -237,10 +280,8 @@ def test_stage3_pipeline():
     logger.info("Testing Stage 3 Pipeline...")
     
     try:
-        from pipeline.stage3_pipeline import Stage3Pipeline
-        
         # Initialize pipeline
-        pipeline = Stage3Pipeline(config={'use_gpu': False})
+        pipeline = get_stage3_pipeline()
         
         # Create test document
         test_doc_path = create_test_document()
@@ -281,20 +322,41 @@ def test_stage3_pipeline():
         logger.error(f"❌ Stage 3 Pipeline test failed: {e}")
         return False
 
+def _init_test_worker():
+    """Keep each worker process single-threaded (see conftest.py for the pytest-xdist side)"""
+    for var in ('OMP_NUM_THREADS', 'OMP_THREAD_LIMIT', 'OPENBLAS_NUM_THREADS',
+                'MKL_NUM_THREADS', 'NUMEXPR_NUM_THREADS'):
+        os.environ.setdefault(var, '1')
+    os.environ.setdefault('TOKENIZERS_PARALLELISM', 'false')
+    cv2.setNumThreads(1)
+    # Forked workers inherit torch if the parent already imported it, past the point
+    # where it reads OMP_NUM_THREADS
+    if 'torch' in sys.modules:
+        sys.modules['torch'].set_num_threads(1)
+
 def main():
     """Run all tests"""
     logger.info("Starting Stage 2 and 3 Tests...")
     
-    test_results = []
+    cases = [
+        # Individual components
+        ("Multilingual OCR", test_multilingual_ocr),
+        ("Language Detection", test_language_detection),
+        ("Visual to Text Generation", test_visual_to_text),
+        # Pipelines
+        ("Stage 2 Pipeline", test_stage2_pipeline),
+        ("Stage 3 Pipeline", test_stage3_pipeline),
+    ]
     
-    # Test individual components
-    test_results.append(("Multilingual OCR", test_multilingual_ocr()))
-    test_results.append(("Language Detection", test_language_detection()))
-    test_results.append(("Visual to Text Generation", test_visual_to_text()))
+    # Both pipeline tests read the test document; write it once before they race for it
+    create_test_document()
     
-    # Test pipelines
-    test_results.append(("Stage 2 Pipeline", test_stage2_pipeline()))
-    test_results.append(("Stage 3 Pipeline", test_stage3_pipeline()))
+    # Each test builds its own models, so run them in separate processes to overlap
+    # the loading; workers stay single-threaded so they do not oversubscribe the cores
+    with ProcessPoolExecutor(max_workers=min(len(cases), os.cpu_count() or 1),
+                             initializer=_init_test_worker) as executor:
+        futures = [(name, executor.submit(fn)) for name, fn in cases]
+        test_results = [(name, future.result()) for name, future in futures]
     
     # Summary
     logger.info("\n" + "="*50)
@@ -0,0 +1,42 @@
+"""
+Shared pytest fixtures for the PS-05 test suite
+"""
+
+import pytest
+
+CONFIG_PATH = "configs/ps05_config.yaml"
+
+# Model-backed components load their weights once per test run. Imports stay inside
+# the fixtures so modules that do not use them (e.g. smoke_test.py) collect without them.
+
+@pytest.fixture(scope="session")
+def ps05_config():
+    """The parsed pipeline config, read once per test run"""
+    import yaml
+    with open(CONFIG_PATH, 'r') as f:
+        return yaml.safe_load(f)
+
+@pytest.fixture(scope="session")
+def layout_detector():
+    from src.models.layout_detector import LayoutDetector
+    return LayoutDetector(CONFIG_PATH)
+
+@pytest.fixture(scope="session")
+def ocr_engine():
+    from src.models.ocr_engine import OCREngine
+    return OCREngine(CONFIG_PATH)
+
+@pytest.fixture(scope="session")
+def lang_classifier():
+    from src.models.langid_classifier import LanguageClassifier
+    return LanguageClassifier(CONFIG_PATH)
+
+@pytest.fixture(scope="session")
+def nl_generator():
+    from src.models.nl_generator import NLGenerator
+    return NLGenerator(CONFIG_PATH)
+
+@pytest.fixture(scope="session")
+def ps05_pipeline():
+    from src.pipeline.infer_page import PS05Pipeline
+    return PS05Pipeline(CONFIG_PATH)
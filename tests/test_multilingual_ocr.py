@@ -0,0 +1,42 @@
+"""
+Tests for the EasyOCR integration helpers in MultilingualOCR
+"""
+
+import pytest
+
+pytest.importorskip("torch")
+pytest.importorskip("easyocr")
+
+from src.ocr.multilingual_ocr import _PinnedDetector, _pinned_get_textbox
+
+def _get_textbox(detector, image, canvas_size, mag_ratio, text_threshold, link_threshold,
+                 low_text, poly, device, optimal_num_chars=None, **kwargs):
+    """Signature of easyocr.detection.get_textbox; returns the device it was given"""
+    return device
+
+def test_pinned_get_textbox_only_rewrites_device_for_pinned_detector():
+    get_textbox = _pinned_get_textbox(_get_textbox)
+    pinned = _PinnedDetector.__new__(_PinnedDetector)
+    
+    # Keyword device, as easyocr.Reader.detect passes it
+    assert get_textbox(pinned, None, 2560, 1.0, 0.7, 0.4, 0.4, False, device='cuda') == 'cpu'
+    # Positional device
+    assert get_textbox(pinned, None, 2560, 1.0, 0.7, 0.4, 0.4, False, 'cuda') == 'cpu'
+    # Any other detector is passed through unchanged
+    assert get_textbox(object(), None, 2560, 1.0, 0.7, 0.4, 0.4, False, device='cuda') == 'cuda'
+
+def test_ocr_batch_maps_unlisted_languages_to_unknown():
+    from src.ocr.multilingual_ocr import OCRBatch, OCRResult, TextRegion, LANG_TABLE, UNKNOWN_IDX
+    regions = [
+        TextRegion(bbox=[0, 0, 10, 5], text="hello", confidence=0.9, language='en', language_confidence=0.8),
+        TextRegion(bbox=[0, 5, 10, 5], text="hallo", confidence=0.7, language='de', language_confidence=0.6),
+        TextRegion(bbox=[0, 10, 10, 5], text="???", confidence=0.1, language='unknown', language_confidence=0.0),
+    ]
+    result = OCRResult(text_regions=regions, overall_text="hello hallo ???",
+                       detected_languages=['en', 'de', 'unknown'], processing_time=0.5)
+    
+    batch = OCRBatch.from_results([result])
+    
+    assert batch.langs.tolist() == [LANG_TABLE.index('en'), UNKNOWN_IDX, UNKNOWN_IDX]
+    assert [region.language for region in batch.regions(0)] == ['en', 'unknown', 'unknown']
+    assert batch.texts == ["hello", "hallo", "???"]
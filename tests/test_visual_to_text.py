@@ -0,0 +1,95 @@
+"""
+Tests for the batched caption generation in VisualToTextGenerator
+"""
+
+import pytest
+
+torch = pytest.importorskip("torch")
+pytest.importorskip("transformers")
+
+from src.nlg.visual_to_text import VisualToTextGenerator
+
+class _RecordingModel:
+    """Stands in for the GIT chart model; records how generate() was called"""
+    
+    def __init__(self):
+        self.calls = []
+    
+    def generate(self, *args, **kwargs):
+        self.calls.append((args, kwargs))
+        batch = kwargs['pixel_values'].shape[0] if 'pixel_values' in kwargs else 1
+        return torch.zeros(batch, 2, dtype=torch.long)
+
+class _Processor:
+    def batch_decode(self, ids, skip_special_tokens=True):
+        return ["caption"] * len(ids)
+
+def _generator(batch_buckets=()):
+    # Skip __init__ so no weights are loaded; only what _generate_texts touches is set
+    generator = VisualToTextGenerator.__new__(VisualToTextGenerator)
+    generator.device = 'cpu'
+    generator.use_gpu = False
+    generator.chart_model = _RecordingModel()
+    generator.chart_processor = _Processor()
+    generator._batch_buckets = batch_buckets
+    return generator
+
+def test_generate_texts_passes_pixel_values_by_keyword():
+    generator = _generator()
+    pixel_values = torch.zeros(2, 3, 224, 224)
+    
+    texts = generator._generate_texts(pixel_values, {'max_length': 8})
+    
+    assert texts == ["caption", "caption"]
+    (args, kwargs), = generator.chart_model.calls
+    assert args == ()
+    assert kwargs['pixel_values'] is pixel_values
+    assert kwargs['max_length'] == 8
+
+def test_generate_texts_pads_to_bucket_with_warmup_signature():
+    # Warm-up compiles generate(pixel_values=...) per bucket; padded batches must match it
+    generator = _generator(batch_buckets=(1, 4))
+    pixel_values = torch.zeros(3, 3, 224, 224)
+    
+    texts = generator._generate_texts(pixel_values, {})
+    
+    assert texts == ["caption"] * 3
+    (args, kwargs), = generator.chart_model.calls
+    assert args == ()
+    assert tuple(kwargs['pixel_values'].shape) == (4, 3, 224, 224)
+
+def test_compile_warmup_uses_inference_decoding_settings(monkeypatch):
+    # Each bucket is warmed up with the exact settings both batch paths decode with
+    monkeypatch.setattr(torch, "compile", lambda fn, **kwargs: fn, raising=False)
+    generator = _generator()
+    generator.use_gpu = True
+    generator.dtype = torch.float32
+    generator.beam_width = 2
+    model = generator.chart_model
+    model.forward = None
+    
+    generator._compile_generate_model(model, "chart/map")
+    
+    from src.nlg.visual_to_text import GRAPH_BATCH_BUCKETS, MAX_NEW_TOKENS
+    expected = [
+        generator._chart_map_generate_kwargs(max(MAX_NEW_TOKENS['chart'], MAX_NEW_TOKENS['map'])),
+        generator._table_generate_kwargs()
+    ]
+    assert generator._batch_buckets == GRAPH_BATCH_BUCKETS
+    assert len(model.calls) == len(GRAPH_BATCH_BUCKETS) * len(expected)
+    for i, (args, kwargs) in enumerate(model.calls):
+        assert args == ()
+        assert kwargs['pixel_values'].shape[0] == GRAPH_BATCH_BUCKETS[i // len(expected)]
+        assert kwargs.pop('min_new_tokens') == kwargs['max_new_tokens']
+        kwargs.pop('pixel_values')
+        assert kwargs == expected[i % len(expected)]
+
+def test_metric_pool_is_spawned_and_closed():
+    with _generator() as generator:
+        generator._cpu_pool = None
+        pool = generator._get_cpu_pool()
+        assert pool._mp_context.get_start_method() == "spawn"
+    
+    assert generator._cpu_pool is None
+    with pytest.raises(RuntimeError):
+        pool.submit(len, ())